@@ -21,17 +21,28 @@ This replaces the scattered calendar writes in:
 - work_calendar_reconciler.py (logic moves here)
 """
 
+import hashlib
 import json
 import logging
 import os
+import random
 import sys
+import threading
 import time
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from functools import partial
 from typing import Dict, List, Set, Tuple, Any, Optional
 
 from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from sqlalchemy import text
+
+try:
+    import orjson  # Optional: faster JSON for the results file
+except ImportError:
+    orjson = None
 
 # Add parent directory to path for config import
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -39,6 +50,156 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import *
 from calpal.core.db_manager import DatabaseManager
 
+# Google Calendar batch requests accept at most 50 calls
+BATCH_SIZE = 50
+
+# How far past the run window a full listing reaches, so the sync-token
+# snapshot stays complete for later runs until their window passes it
+_SYNC_CACHE_HORIZON = timedelta(days=30)
+
+# Time zone for timed events written to Google Calendar
+_TIMEZONE = 'America/Los_Angeles'
+
+# Records last_action for many events in one statement from parallel arrays
+_LAST_ACTION_SQL = text("""
+    UPDATE calendar_events
+    SET last_action = data.last_action,
+        last_action_at = NOW()
+    FROM unnest(
+        CAST(:event_ids AS text[]),
+        CAST(:calendar_ids AS text[]),
+        CAST(:last_actions AS text[])
+    ) AS data(event_id, calendar_id, last_action)
+    WHERE calendar_events.event_id = data.event_id
+    AND calendar_events.current_calendar = data.calendar_id
+""")
+
+# Active events for a calendar that are not among the given Google event IDs
+_MISSING_EVENTS_SQL = text("""
+    SELECT
+        event_id,
+        summary,
+        description,
+        location,
+        start_time,
+        end_time,
+        event_type,
+        metadata
+    FROM calendar_events
+    WHERE current_calendar = :calendar_id
+    AND deleted_at IS NULL
+    AND status = 'active'
+    AND NOT (event_id = ANY(CAST(:gcal_ids AS text[])))
+""")
+
+# Given Google event IDs that are not active events for the calendar (stale)
+_STALE_IDS_SQL = text("""
+    SELECT unnest(CAST(:gcal_ids AS text[]))
+    EXCEPT
+    SELECT event_id
+    FROM calendar_events
+    WHERE current_calendar = :calendar_id
+    AND deleted_at IS NULL
+    AND status = 'active'
+    AND event_id = ANY(CAST(:gcal_ids AS text[]))
+""")
+
+# Events marked deleted in the database that are still to be removed from Google
+_EVENTS_TO_DELETE_SQL = text("""
+    SELECT
+        event_id,
+        current_calendar,
+        summary,
+        deleted_at,
+        last_action
+    FROM calendar_events
+    WHERE current_calendar = :calendar_id
+    AND deleted_at IS NOT NULL
+    AND status = 'deleted'
+    AND last_action NOT IN ('removed_from_google', 'already_removed')
+    ORDER BY deleted_at
+    LIMIT 500
+""")
+
+# Active mirror events (any event with source_event_id)
+_MIRROR_COUNT_SQL = text("""
+    SELECT COUNT(*)
+    FROM calendar_events
+    WHERE deleted_at IS NULL
+    AND status = 'active'
+    AND source_event_id IS NOT NULL
+""")
+
+# Active mirrors whose source has a deleted row and no live one, one row per mirror
+_ORPHAN_MIRRORS_SQL = text("""
+    SELECT DISTINCT ON (m.event_id, m.current_calendar)
+        m.event_id,
+        m.summary,
+        m.current_calendar,
+        s.deleted_at AS source_deleted
+    FROM calendar_events m
+    JOIN calendar_events s
+        ON s.event_id = m.source_event_id
+        AND s.current_calendar = m.source_calendar
+    WHERE m.deleted_at IS NULL
+    AND m.status = 'active'
+    AND m.source_event_id IS NOT NULL
+    AND s.deleted_at IS NOT NULL
+    AND NOT EXISTS (
+        SELECT 1 FROM calendar_events a
+        WHERE a.event_id = m.source_event_id
+        AND a.current_calendar = m.source_calendar
+        AND a.deleted_at IS NULL
+    )
+    ORDER BY m.event_id, m.current_calendar, s.deleted_at
+""")
+
+# Marks every active mirror of a deleted source with no live row as deleted
+_MARK_ORPHANS_SQL = text("""
+    UPDATE calendar_events m
+    SET deleted_at = NOW(),
+        status = 'deleted',
+        last_action = 'source_deleted_orphan',
+        last_action_at = NOW()
+    FROM calendar_events s
+    WHERE s.event_id = m.source_event_id
+    AND s.current_calendar = m.source_calendar
+    AND s.deleted_at IS NOT NULL
+    AND m.deleted_at IS NULL
+    AND m.status = 'active'
+    AND NOT EXISTS (
+        SELECT 1 FROM calendar_events a
+        WHERE a.event_id = m.source_event_id
+        AND a.current_calendar = m.source_calendar
+        AND a.deleted_at IS NULL
+    )
+""")
+
+
+class TokenBucket:
+    """Thread-safe token bucket for pacing Google Calendar requests."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, count: int = 1):
+        """Take count tokens, blocking only until the bucket holds that many."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            if self.tokens < count:
+                time.sleep((count - self.tokens) / self.rate)
+                self.tokens = 0.0
+                self.updated = time.monotonic()
+            else:
+                self.tokens -= count
+
 
 class UnifiedCalendarSync:
     """
@@ -48,12 +209,16 @@ class UnifiedCalendarSync:
     """
 
     def __init__(self, dry_run: bool = True, deletions_only: bool = False,
-                 batch_size: int = None, calendar_filter: str = None):
+                 batch_size: int = None, calendar_filter: str = None,
+                 include_stale: bool = True):
         self.logger = logging.getLogger('unified-calendar-sync')
         self.dry_run = dry_run
         self.deletions_only = deletions_only
         self.batch_size = batch_size
         self.calendar_filter = calendar_filter
+        self.include_stale = include_stale
+        self.batch_retries = 5
+        self.sync_workers = 8
 
         if self.dry_run:
             self.logger.warning("🧪 DRY RUN MODE - No changes will be made to Google Calendar")
@@ -63,6 +228,9 @@ class UnifiedCalendarSync:
         if self.deletions_only:
             self.logger.info("🗑️  DELETIONS ONLY MODE - Will only remove events, not create them")
 
+        if not self.include_stale:
+            self.logger.info("🧹 SKIP STALE - Events on calendar but not in database are left alone")
+
         if self.batch_size:
             self.logger.info(f"📦 BATCH SIZE: {self.batch_size} operations per run")
 
@@ -74,12 +242,32 @@ class UnifiedCalendarSync:
         if not self.db.test_connection():
             raise Exception("Failed to connect to database")
 
-        # Initialize Google Calendar service
-        self.calendar_service = self._initialize_calendar_service()
+        # Google Calendar writes, shared by sync workers. Each batch takes one
+        # token per operation, so writes are paced at 10/s (600/min) - the same
+        # rate as the old 100ms per-event sleep - with one full batch of burst
+        self._rate = TokenBucket(rate=10, burst=BATCH_SIZE)
+
+        # Initialize Google Calendar service (one per thread, see calendar_service)
+        self._local = threading.local()
+        self._local.calendar_service = self._initialize_calendar_service()
 
         # Load calendars to sync
         self.calendars_to_sync = self._load_calendar_list()
 
+        # (name, id) pairs selected by calendar_filter, in configured order
+        self._active_calendars = tuple(
+            (calendar_name, calendar_id)
+            for calendar_name, calendar_id in self.calendars_to_sync.items()
+            if not self.calendar_filter or calendar_name == self.calendar_filter
+        )
+
+        # Listing window (last 3 months to 12 months forward), fixed for the run
+        # so every calendar is compared over the same range
+        now = datetime.now()
+        self._run_window_start = now - timedelta(days=90)
+        self._run_window_end = now + timedelta(days=365)
+        self._run_time_min = self._run_window_start.isoformat() + 'Z'
+
         # Statistics
         self.stats = {
             'events_created': 0,
@@ -89,6 +277,18 @@ class UnifiedCalendarSync:
             'errors': 0
         }
 
+    @property
+    def calendar_service(self):
+        """Google Calendar API service for the calling thread.
+
+        The underlying httplib2 connection is not thread-safe, so each
+        calendar sync worker gets its own service.
+        """
+        service = getattr(self._local, 'calendar_service', None)
+        if service is None:
+            service = self._local.calendar_service = self._initialize_calendar_service()
+        return service
+
     def _initialize_calendar_service(self):
         """Initialize Google Calendar API service."""
         try:
@@ -123,80 +323,182 @@ class UnifiedCalendarSync:
         self.logger.info(f"📅 Will sync {len(calendars)} calendars")
         return calendars
 
-    def _get_active_db_events(self, calendar_id: str) -> Dict[str, Dict]:
+    def _get_active_db_events(self, session, calendar_id: str,
+                              gcal_ids: List[str]) -> Tuple[Dict[str, Dict], Set[str]]:
         """
-        Get all events that SHOULD exist on this calendar according to database.
+        Get events that SHOULD exist on this calendar according to database,
+        split against the event IDs currently on Google Calendar.
 
-        Returns: {event_id: event_data}
+        Both differences are computed by PostgreSQL: only rows missing from the
+        calendar are fetched in full, and only stale calendar IDs come back.
+
+        Returns: ({event_id: event_data} to create, {event_id} stale on calendar)
         """
         try:
-            from sqlalchemy import text
+            params = {'calendar_id': calendar_id, 'gcal_ids': gcal_ids}
 
-            with self.db.get_session() as session:
-                result = session.execute(
-                    text("""
-                        SELECT
-                            event_id,
-                            summary,
-                            description,
-                            location,
-                            start_time,
-                            end_time,
-                            event_type,
-                            metadata
-                        FROM calendar_events
-                        WHERE current_calendar = :calendar_id
-                        AND deleted_at IS NULL
-                        AND status = 'active'
-                    """),
-                    {'calendar_id': calendar_id}
-                ).mappings().all()
+            result = session.execute(_MISSING_EVENTS_SQL, params).mappings().all()
 
-                events = {}
-                for row in result:
-                    events[row['event_id']] = dict(row)
+            events = {}
+            for row in result:
+                events[row['event_id']] = dict(row)
+
+            stale_ids = set(session.execute(_STALE_IDS_SQL, params).scalars())
 
-                return events
+            return events, stale_ids
 
         except Exception as e:
             self.logger.error(f"Error getting active DB events: {e}")
-            return {}
+            session.rollback()
+            return {}, set()
+
+    @staticmethod
+    def _parse_gcal_time(value: Dict) -> Optional[datetime]:
+        """Parse a Google Calendar start/end into a naive UTC datetime."""
+        if 'dateTime' in value:
+            parsed = datetime.fromisoformat(value['dateTime'])
+            if parsed.tzinfo:
+                parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+            return parsed
+        if 'date' in value:
+            return datetime.fromisoformat(value['date'])
+        return None
+
+    def _in_window(self, event: Dict, window_start: datetime, window_end: datetime) -> bool:
+        """Check whether an event overlaps the listing window, like timeMin/timeMax."""
+        start = self._parse_gcal_time(event.get('start', {}))
+        end = self._parse_gcal_time(event.get('end', {}))
+        return (end is None or end > window_start) and (start is None or start < window_end)
+
+    def _sync_cache_path(self, calendar_id: str) -> str:
+        """Path of the incremental sync cache (sync token + events) for a calendar."""
+        digest = hashlib.sha1(calendar_id.encode()).hexdigest()[:16]
+        return os.path.join(DATA_DIR, 'gcal_sync_cache', f'{digest}.json')
+
+    def _load_sync_cache(self, calendar_id: str) -> Optional[Dict]:
+        """Load the incremental sync cache for a calendar, if any."""
+        try:
+            with open(self._sync_cache_path(calendar_id), 'r') as f:
+                cache = json.load(f)
+            if cache.get('calendar_id') == calendar_id and cache.get('sync_token'):
+                return cache
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.logger.warning(f"  ⚠️  Ignoring unreadable sync cache for {calendar_id}: {e}")
+        return None
+
+    def _save_sync_cache(self, calendar_id: str, sync_token: str, events: Dict[str, Dict],
+                         listed_until: str):
+        """
+        Atomically persist the sync token and event snapshot for a calendar.
+
+        listed_until is the timeMax of the full listing that seeded the
+        snapshot; events beyond it were never fetched.
+        """
+        cache_file = self._sync_cache_path(calendar_id)
+        tmp_file = cache_file + '.tmp'
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            with open(tmp_file, 'w') as f:
+                json.dump({'calendar_id': calendar_id, 'sync_token': sync_token,
+                           'listed_until': listed_until, 'events': events}, f)
+            os.replace(tmp_file, cache_file)
+        except Exception as e:
+            self.logger.warning(f"  ⚠️  Failed to save sync cache for {calendar_id}: {e}")
+
+    def _list_events(self, calendar_id: str, events: Dict[str, Dict], **params) -> Optional[str]:
+        """
+        Page through events().list, applying each item to events in place.
+
+        Cancelled items (only returned by incremental listings) are removed.
+        Returns the nextSyncToken from the final page, if Google sent one.
+        """
+        page_token = None
+
+        while True:
+            events_result = self.calendar_service.events().list(
+                calendarId=calendar_id,
+                maxResults=2500,
+                singleEvents=True,
+                pageToken=page_token,
+                fields='items(id,status,summary,start,end),nextPageToken,nextSyncToken',
+                **params
+            ).execute()
+
+            for event in events_result.get('items', []):
+                event_id = event.get('id')
+                if not event_id:
+                    continue
+                if event.get('status') == 'cancelled':
+                    events.pop(event_id, None)
+                else:
+                    events[event_id] = event
+
+            page_token = events_result.get('nextPageToken')
+            if not page_token:
+                return events_result.get('nextSyncToken')
 
     def _get_calendar_events(self, calendar_id: str, calendar_name: str) -> Dict[str, Dict]:
         """
         Get all events currently on Google Calendar.
 
+        After a full listing, only changes since the previous run are fetched
+        using the calendar's sync token; the cached snapshot is then filtered
+        to the same window a full listing would cover. The full listing
+        reaches _SYNC_CACHE_HORIZON past the window and is redone once the
+        window moves beyond it, since unchanged events past its timeMax
+        never arrive as changes.
+
         Returns: {event_id: event_data}
         """
         try:
-            # Query last 3 months to 12 months forward
-            time_min = (datetime.now() - timedelta(days=90)).isoformat() + 'Z'
-            time_max = (datetime.now() + timedelta(days=365)).isoformat() + 'Z'
+            window_start = self._run_window_start
+            window_end = self._run_window_end
 
-            events = {}
-            page_token = None
-
-            while True:
-                events_result = self.calendar_service.events().list(
-                    calendarId=calendar_id,
-                    timeMin=time_min,
-                    timeMax=time_max,
-                    maxResults=2500,
-                    singleEvents=True,
-                    orderBy='startTime',
-                    pageToken=page_token
-                ).execute()
-
-                batch_events = events_result.get('items', [])
-
-                for event in batch_events:
-                    event_id = event.get('id')
-                    if event_id:
-                        events[event_id] = event
-
-                page_token = events_result.get('nextPageToken')
-                if not page_token:
-                    break
+            events = None
+            cache = self._load_sync_cache(calendar_id)
+
+            if cache and (not cache.get('listed_until')
+                          or datetime.fromisoformat(cache['listed_until'].rstrip('Z')) < window_end):
+                self.logger.info(f"  🔄 Sync cache for {calendar_name} no longer covers the window, doing full listing")
+                cache = None
+
+            if cache:
+                try:
+                    events = cache['events']
+                    listed_until = cache['listed_until']
+                    sync_token = self._list_events(calendar_id, events, syncToken=cache['sync_token'])
+                    self.logger.debug(f"  Applied incremental changes for {calendar_name}")
+                except HttpError as e:
+                    if e.resp.status != 410:
+                        raise
+                    # Sync token expired, start over with a full listing
+                    self.logger.info(f"  🔄 Sync token expired for {calendar_name}, doing full listing")
+                    events = None
+
+            if events is None:
+                events = {}
+                listed_until = (window_end + _SYNC_CACHE_HORIZON).isoformat() + 'Z'
+                sync_token = self._list_events(
+                    calendar_id, events,
+                    timeMin=self._run_time_min,
+                    timeMax=listed_until
+                )
+
+            if sync_token:
+                # Drop events that ended before the window; it only moves forward
+                listed_end = datetime.fromisoformat(listed_until.rstrip('Z'))
+                events = {
+                    event_id: event for event_id, event in events.items()
+                    if self._in_window(event, window_start, listed_end)
+                }
+                self._save_sync_cache(calendar_id, sync_token, events, listed_until)
+
+            events = {
+                event_id: event for event_id, event in events.items()
+                if self._in_window(event, window_start, window_end)
+            }
 
             self.logger.debug(f"  Found {len(events)} events on {calendar_name}")
             return events
@@ -211,38 +513,19 @@ class UnifiedCalendarSync:
             self.logger.error(f"  Error fetching events from {calendar_name}: {e}")
             return {}
 
-    def _get_events_to_delete(self, calendar_id: str) -> List[Dict]:
+    def _get_events_to_delete(self, session, calendar_id: str) -> List[Dict]:
         """
         Get events that should be DELETED from Google Calendar.
         These are events marked deleted_at != NULL in database.
         """
         try:
-            from sqlalchemy import text
+            result = session.execute(_EVENTS_TO_DELETE_SQL, {'calendar_id': calendar_id}).mappings().all()
 
-            with self.db.get_session() as session:
-                result = session.execute(
-                    text("""
-                        SELECT
-                            event_id,
-                            current_calendar,
-                            summary,
-                            deleted_at,
-                            last_action
-                        FROM calendar_events
-                        WHERE current_calendar = :calendar_id
-                        AND deleted_at IS NOT NULL
-                        AND status = 'deleted'
-                        AND last_action NOT IN ('removed_from_google', 'already_removed')
-                        ORDER BY deleted_at
-                        LIMIT 500
-                    """),
-                    {'calendar_id': calendar_id}
-                ).mappings().all()
-
-                return [dict(row) for row in result]
+            return [dict(row) for row in result]
 
         except Exception as e:
             self.logger.error(f"Error getting events to delete: {e}")
+            session.rollback()
             return []
 
     def _build_google_event(self, db_event: Dict) -> Dict:
@@ -251,26 +534,24 @@ class UnifiedCalendarSync:
             start_time = db_event['start_time']
             end_time = db_event['end_time']
 
+            if not isinstance(start_time, datetime):
+                raise TypeError(f"start_time is {type(start_time).__name__}, expected datetime")
+
+            google_event = {
+                'summary': db_event['summary'],
+                'description': db_event.get('description', ''),
+                'location': db_event.get('location', ''),
+            }
+
             # Handle all-day events vs timed events
-            if isinstance(start_time, datetime):
-                if start_time.hour == 0 and start_time.minute == 0 and start_time.second == 0:
-                    # Likely all-day event
-                    google_event = {
-                        'summary': db_event['summary'],
-                        'description': db_event.get('description', ''),
-                        'location': db_event.get('location', ''),
-                        'start': {'date': start_time.strftime('%Y-%m-%d')},
-                        'end': {'date': end_time.strftime('%Y-%m-%d')},
-                    }
-                else:
-                    # Timed event
-                    google_event = {
-                        'summary': db_event['summary'],
-                        'description': db_event.get('description', ''),
-                        'location': db_event.get('location', ''),
-                        'start': {'dateTime': start_time.isoformat(), 'timeZone': 'America/Los_Angeles'},
-                        'end': {'dateTime': end_time.isoformat(), 'timeZone': 'America/Los_Angeles'},
-                    }
+            if start_time.hour == 0 and start_time.minute == 0 and start_time.second == 0:
+                # Likely all-day event; date.isoformat() avoids strftime's format parsing
+                google_event['start'] = {'date': start_time.date().isoformat()}
+                google_event['end'] = {'date': end_time.date().isoformat()}
+            else:
+                # Timed event
+                google_event['start'] = {'dateTime': start_time.isoformat(), 'timeZone': _TIMEZONE}
+                google_event['end'] = {'dateTime': end_time.isoformat(), 'timeZone': _TIMEZONE}
 
             # Add extended properties from metadata
             metadata = db_event.get('metadata', {})
@@ -305,46 +586,56 @@ class UnifiedCalendarSync:
             'errors': 0
         }
 
-        # Step 1: Get database state (what SHOULD exist)
-        self.logger.info("📊 Getting database state...")
-        db_events = self._get_active_db_events(calendar_id)
-        self.logger.info(f"  Database says {len(db_events)} events should exist")
-
-        # Step 2: Get Google Calendar state (what DOES exist)
-        self.logger.info("☁️  Getting Google Calendar state...")
-        gcal_events = self._get_calendar_events(calendar_id, calendar_name)
-        self.logger.info(f"  Google Calendar has {len(gcal_events)} events")
-
-        # Step 3: Compute differences
-        db_event_ids = set(db_events.keys())
-        gcal_event_ids = set(gcal_events.keys())
-
-        to_create = db_event_ids - gcal_event_ids  # In DB, not on calendar
-        to_delete = gcal_event_ids - db_event_ids  # On calendar, not in DB (stale)
-
-        local_stats['events_to_create'] = len(to_create)
-        local_stats['events_to_delete'] = len(to_delete)
-
-        self.logger.info(f"\n📋 Sync Plan:")
-        self.logger.info(f"  Events to CREATE: {len(to_create)}")
-        self.logger.info(f"  Events to DELETE: {len(to_delete)}")
-
-        # Step 4: Handle deletions (events marked deleted_at in DB)
-        self.logger.info(f"\n🗑️  Checking for explicitly deleted events...")
-        explicitly_deleted = self._get_events_to_delete(calendar_id)
-        self.logger.info(f"  Found {len(explicitly_deleted)} events marked for deletion")
-
-        if explicitly_deleted:
-            for event in explicitly_deleted[:5]:  # Show first 5
-                self.logger.info(f"    - {event['summary']} (deleted {event['deleted_at']})")
-            if len(explicitly_deleted) > 5:
-                self.logger.info(f"    ... and {len(explicitly_deleted) - 5} more")
-
-        # Step 5: Apply changes (or log if dry run)
-        if self.dry_run:
-            self._log_proposed_changes(calendar_name, to_create, to_delete, db_events, gcal_events, explicitly_deleted)
-        else:
-            self._apply_changes(calendar_name, calendar_id, to_create, to_delete, db_events, explicitly_deleted, local_stats)
+        # One database session for every phase of this calendar's sync
+        with self.db.get_session() as session:
+            if self.deletions_only and not self.include_stale:
+                # Nothing to create or prune, so neither side needs listing
+                self.logger.info("⏭️  Skipping Google Calendar listing (deletions-only, no stale cleanup)")
+                db_events, gcal_events = {}, {}
+                to_create, to_delete = set(), set()
+            else:
+                # Step 1: Get Google Calendar state (what DOES exist)
+                self.logger.info("☁️  Getting Google Calendar state...")
+                gcal_events = self._get_calendar_events(calendar_id, calendar_name)
+                self.logger.info(f"  Google Calendar has {len(gcal_events)} events")
+
+                # Step 2: Get database state (what SHOULD exist), diffed in SQL
+                # against the calendar's event IDs
+                self.logger.info("📊 Getting database state...")
+                db_events, stale_ids = self._get_active_db_events(session, calendar_id, list(gcal_events))
+                self.logger.info(f"  Database says {len(db_events) + len(gcal_events) - len(stale_ids)} events should exist")
+
+                # Step 3: Compute differences
+                to_create = set(db_events)  # In DB, not on calendar
+                to_delete = stale_ids if self.include_stale else set()  # On calendar, not in DB (stale)
+
+            local_stats['events_to_create'] = len(to_create)
+            local_stats['events_to_delete'] = len(to_delete)
+
+            self.logger.info(f"\n📋 Sync Plan:")
+            self.logger.info(f"  Events to CREATE: {len(to_create)}")
+            self.logger.info(f"  Events to DELETE: {len(to_delete)}")
+
+            # Step 4: Handle deletions (events marked deleted_at in DB)
+            self.logger.info(f"\n🗑️  Checking for explicitly deleted events...")
+            explicitly_deleted = self._get_events_to_delete(session, calendar_id)
+            self.logger.info(f"  Found {len(explicitly_deleted)} events marked for deletion")
+
+            if explicitly_deleted:
+                for event in explicitly_deleted[:5]:  # Show first 5
+                    self.logger.info(f"    - {event['summary']} (deleted {event['deleted_at']})")
+                if len(explicitly_deleted) > 5:
+                    self.logger.info(f"    ... and {len(explicitly_deleted) - 5} more")
+
+            # End the read transaction; the connection stays checked out for
+            # the last_action writes
+            session.commit()
+
+            # Step 5: Apply changes (or log if dry run)
+            if self.dry_run:
+                self._log_proposed_changes(calendar_name, to_create, to_delete, db_events, gcal_events, explicitly_deleted)
+            else:
+                self._apply_changes(session, calendar_name, calendar_id, to_create, to_delete, db_events, explicitly_deleted, local_stats)
 
         return local_stats
 
@@ -381,171 +672,158 @@ class UnifiedCalendarSync:
         if not to_create and not to_delete and not explicitly_deleted:
             self.logger.info("  ✅ Calendar is in sync - no changes needed")
 
-    def _apply_changes(self, calendar_name: str, calendar_id: str,
-                      to_create: Set[str], to_delete: Set[str],
-                      db_events: Dict, explicitly_deleted: List[Dict],
-                      local_stats: Dict):
-        """Apply changes to Google Calendar (LIVE MODE)."""
-        from sqlalchemy import text
+    @staticmethod
+    def _is_retryable(exception: Exception) -> bool:
+        """Check whether a failed batch request is worth retrying."""
+        if not isinstance(exception, HttpError):
+            return False
+        return exception.resp.status in (429, 500, 502, 503, 504) or 'rateLimitExceeded' in str(exception)
+
+    def _batch_cb(self, ops: List[Dict], local_stats: Dict, retry: Optional[List[Dict]],
+                  updates: List[Dict], request_id: str, response: Dict, exception: Exception):
+        """Handle one batched delete/insert result."""
+        op = ops[int(request_id)]
+        is_delete = op['method'] == 'delete'
+
+        if exception is not None:
+            if is_delete and isinstance(exception, HttpError) and exception.resp.status in [404, 410]:
+                # Already gone
+                local_stats['deleted'] += 1
+                if op['track']:
+                    updates.append({'event_id': op['event_id'], 'calendar_id': op['calendar_id'],
+                                    'last_action': 'already_removed'})
+            elif retry is not None and self._is_retryable(exception):
+                retry.append(op)
+            else:
+                action = 'delete' if is_delete else 'create event'
+                self.logger.error(f"  ❌ Failed to {action} {op['summary']}: {exception}")
+                local_stats['errors'] += 1
+            return
+
+        if is_delete:
+            local_stats['deleted'] += 1
+            last_action = 'removed_from_google'
+            self.logger.debug(f"  ✅ Deleted {op['summary']}")
+        else:
+            local_stats['created'] += 1
+            last_action = 'synced_to_google'
+            self.logger.debug(f"  ✅ Created {op['summary']}")
 
-        self.logger.info(f"\n🔴 LIVE MODE - Applying changes to {calendar_name}...")
+        if op['track']:
+            updates.append({'event_id': op['event_id'], 'calendar_id': op['calendar_id'],
+                            'last_action': last_action})
 
-        # Track operations for batch limiting
-        operations_count = 0
-        batch_limit_reached = False
+    def _record_last_actions(self, session, updates: List[Dict]):
+        """Write and commit last_action for a batch of events in a single UPDATE."""
+        try:
+            session.execute(_LAST_ACTION_SQL, {
+                'event_ids': [update['event_id'] for update in updates],
+                'calendar_ids': [update['calendar_id'] for update in updates],
+                'last_actions': [update['last_action'] for update in updates]
+            })
+            session.commit()
+        except Exception as e:
+            self.logger.error(f"  ❌ Failed to record last_action for {len(updates)} events: {e}")
+            session.rollback()
 
-        # Delete stale events (on calendar but not in DB)
-        if to_delete and not batch_limit_reached:
-            events_to_process = list(to_delete)[:self.batch_size] if self.batch_size else list(to_delete)
-            self.logger.info(f"\n❌ Deleting {len(events_to_process)} stale events...")
+    def _execute_batched(self, session, ops: List[Dict], local_stats: Dict):
+        """Send queued deletes/inserts to Google Calendar through batch requests.
 
-            for event_id in events_to_process:
-                if self.batch_size and operations_count >= self.batch_size:
-                    self.logger.info(f"  ⏸️  Batch limit ({self.batch_size}) reached, stopping")
-                    batch_limit_reached = True
-                    break
+        Sends at most BATCH_SIZE operations per HTTP round-trip and records
+        each batch's last_action updates in one statement. Rate-limited or
+        5xx operations are retried with exponential backoff.
+        """
+        events = self.calendar_service.events()
+        pending = ops
+        for attempt in range(self.batch_retries + 1):
+            if not pending:
+                break
+            if attempt:
+                wait = min(2 ** attempt, 32) + random.random()
+                self.logger.warning(f"  ⏳ Rate limit hit, retrying {len(pending)} operations in {wait:.1f} seconds...")
+                time.sleep(wait)
+
+            retry = [] if attempt < self.batch_retries else None
+            for start in range(0, len(pending), BATCH_SIZE):
+                chunk = pending[start:start + BATCH_SIZE]
+                updates = []
+                batch = self.calendar_service.new_batch_http_request(
+                    callback=partial(self._batch_cb, chunk, local_stats, retry, updates)
+                )
+                for index, op in enumerate(chunk):
+                    if op['method'] == 'delete':
+                        request = events.delete(calendarId=op['calendar_id'], eventId=op['event_id'])
+                    else:
+                        request = events.insert(calendarId=op['calendar_id'], body=op['body'], fields='id')
+                    batch.add(request, request_id=str(index))
 
                 try:
-                    time.sleep(0.1)  # Rate limiting
+                    self._rate.acquire(len(chunk))
+                    batch.execute()
+                except Exception as e:
+                    self.logger.error(f"  ❌ Batch request failed: {e}")
+                    local_stats['errors'] += len(chunk)
 
-                    self.calendar_service.events().delete(
-                        calendarId=calendar_id,
-                        eventId=event_id
-                    ).execute()
+                if updates:
+                    self._record_last_actions(session, updates)
 
-                    local_stats['deleted'] += 1
-                    operations_count += 1
-                    self.logger.debug(f"  ✅ Deleted stale event {event_id}")
+            pending = retry or []
 
-                except HttpError as e:
-                    if e.resp.status in [404, 410]:
-                        # Already gone
-                        local_stats['deleted'] += 1
-                        operations_count += 1
-                    else:
-                        self.logger.error(f"  ❌ Failed to delete {event_id}: {e}")
-                        local_stats['errors'] += 1
+    def _apply_changes(self, session, calendar_name: str, calendar_id: str,
+                      to_create: Set[str], to_delete: Set[str],
+                      db_events: Dict, explicitly_deleted: List[Dict],
+                      local_stats: Dict):
+        """Apply changes to Google Calendar (LIVE MODE)."""
+        self.logger.info(f"\n🔴 LIVE MODE - Applying changes to {calendar_name}...")
+
+        # Operations queued for batch requests, capped at batch_size
+        ops = []
+        limit = self.batch_size
+
+        # Delete stale events (on calendar but not in DB)
+        if to_delete:
+            events_to_process = list(to_delete)[:limit] if limit else list(to_delete)
+            self.logger.info(f"\n❌ Deleting {len(events_to_process)} stale events...")
+            ops.extend(
+                {'method': 'delete', 'calendar_id': calendar_id, 'event_id': event_id,
+                 'summary': f"stale event {event_id}", 'track': False}
+                for event_id in events_to_process
+            )
 
         # Delete explicitly deleted events (marked deleted_at in DB)
-        if explicitly_deleted and not batch_limit_reached:
-            events_to_process = explicitly_deleted[:self.batch_size - operations_count] if self.batch_size else explicitly_deleted
+        if explicitly_deleted and not (limit and len(ops) >= limit):
+            events_to_process = explicitly_deleted[:limit - len(ops)] if limit else explicitly_deleted
             self.logger.info(f"\n🗑️  Deleting {len(events_to_process)} explicitly deleted events...")
-
-            with self.db.get_session() as session:
-                for event in events_to_process:
-                    if self.batch_size and operations_count >= self.batch_size:
-                        self.logger.info(f"  ⏸️  Batch limit ({self.batch_size}) reached, stopping")
-                        batch_limit_reached = True
-                        break
-
-                    try:
-                        time.sleep(0.1)  # Rate limiting
-
-                        self.calendar_service.events().delete(
-                            calendarId=event['current_calendar'],
-                            eventId=event['event_id']
-                        ).execute()
-
-                        # Mark as removed in database
-                        session.execute(
-                            text("""
-                                UPDATE calendar_events
-                                SET last_action = 'removed_from_google',
-                                    last_action_at = NOW()
-                                WHERE event_id = :event_id
-                                AND current_calendar = :calendar_id
-                            """),
-                            {
-                                'event_id': event['event_id'],
-                                'calendar_id': event['current_calendar']
-                            }
-                        )
-
-                        local_stats['deleted'] += 1
-                        operations_count += 1
-                        self.logger.debug(f"  ✅ Deleted {event['summary']}")
-
-                    except HttpError as e:
-                        if e.resp.status in [404, 410]:
-                            # Already gone
-                            session.execute(
-                                text("""
-                                    UPDATE calendar_events
-                                    SET last_action = 'already_removed',
-                                        last_action_at = NOW()
-                                    WHERE event_id = :event_id
-                                    AND current_calendar = :calendar_id
-                                """),
-                                {
-                                    'event_id': event['event_id'],
-                                    'calendar_id': event['current_calendar']
-                                }
-                            )
-                            local_stats['deleted'] += 1
-                            operations_count += 1
-                        else:
-                            self.logger.error(f"  ❌ Failed to delete {event['summary']}: {e}")
-                            local_stats['errors'] += 1
-                    except Exception as e:
-                        self.logger.error(f"  ❌ Error deleting {event['summary']}: {e}")
-                        local_stats['errors'] += 1
-
-                session.commit()
+            ops.extend(
+                {'method': 'delete', 'calendar_id': event['current_calendar'], 'event_id': event['event_id'],
+                 'summary': event['summary'], 'track': True}
+                for event in events_to_process
+            )
 
         # Create missing events (in DB but not on calendar)
-        if to_create and not self.deletions_only and not batch_limit_reached:
-            events_to_process = list(to_create)[:self.batch_size - operations_count] if self.batch_size else list(to_create)
+        if to_create and not self.deletions_only and not (limit and len(ops) >= limit):
+            events_to_process = list(to_create)[:limit - len(ops)] if limit else list(to_create)
             self.logger.info(f"\n➕ Creating {len(events_to_process)} missing events...")
 
-            with self.db.get_session() as session:
-                for event_id in events_to_process:
-                    if self.batch_size and operations_count >= self.batch_size:
-                        self.logger.info(f"  ⏸️  Batch limit ({self.batch_size}) reached, stopping")
-                        break
-
-                    try:
-                        time.sleep(0.1)  # Rate limiting
-
-                        db_event = db_events[event_id]
-                        google_event = self._build_google_event(db_event)
-
-                        if not google_event:
-                            local_stats['errors'] += 1
-                            continue
-
-                        # Create on Google Calendar
-                        created_event = self.calendar_service.events().insert(
-                            calendarId=calendar_id,
-                            body=google_event
-                        ).execute()
-
-                        # Update database with last_action
-                        session.execute(
-                            text("""
-                                UPDATE calendar_events
-                                SET last_action = 'synced_to_google',
-                                    last_action_at = NOW()
-                                WHERE event_id = :event_id
-                                AND current_calendar = :calendar_id
-                            """),
-                            {
-                                'event_id': event_id,
-                                'calendar_id': calendar_id
-                            }
-                        )
-
-                        local_stats['created'] += 1
-                        operations_count += 1
-                        self.logger.debug(f"  ✅ Created {db_event['summary']}")
-
-                    except Exception as e:
-                        self.logger.error(f"  ❌ Failed to create event {event_id}: {e}")
-                        local_stats['errors'] += 1
-
-                session.commit()
+            for event_id in events_to_process:
+                db_event = db_events[event_id]
+                google_event = self._build_google_event(db_event)
+
+                if not google_event:
+                    local_stats['errors'] += 1
+                    continue
+
+                ops.append({'method': 'insert', 'calendar_id': calendar_id, 'event_id': event_id,
+                            'summary': db_event['summary'], 'body': google_event, 'track': True})
         elif to_create and self.deletions_only:
             self.logger.info(f"\n⏭️  Skipping creation of {len(to_create)} events (deletions-only mode)")
 
+        requested = len(to_delete) + len(explicitly_deleted) + (0 if self.deletions_only else len(to_create))
+        if limit and requested > limit:
+            self.logger.info(f"  ⏸️  Batch limit ({limit}) reached, stopping")
+
+        self._execute_batched(session, ops, local_stats)
+
         self.logger.info(f"\n✅ Sync complete for {calendar_name}")
         self.logger.info(f"  Created: {local_stats['created']}")
         self.logger.info(f"  Deleted: {local_stats['deleted']}")
@@ -562,83 +840,41 @@ class UnifiedCalendarSync:
         self.logger.info(f"{'='*60}")
 
         try:
-            from sqlalchemy import text
-
             with self.db.get_session() as session:
-                # Find all active mirror events (any event with source_event_id)
-                mirrors = session.execute(
-                    text("""
-                        SELECT
-                            m.event_id,
-                            m.summary,
-                            m.event_type,
-                            m.current_calendar,
-                            m.metadata->>'source_event_id' as source_id,
-                            m.source_calendar as source_cal
-                        FROM calendar_events m
-                        WHERE m.deleted_at IS NULL
-                        AND m.status = 'active'
-                        AND m.metadata->>'source_event_id' IS NOT NULL
-                    """)
-                ).mappings().all()
+                # Count active mirror events (any event with source_event_id)
+                checked = session.execute(_MIRROR_COUNT_SQL).scalar()
+
+                self.logger.info(f"  Checking {checked} mirror events...")
+
+                if not checked:
+                    # No active mirrors, so nothing can be orphaned
+                    self.logger.info("  ✅ No active mirrors to check")
+                    return {'checked': 0, 'orphaned': 0, 'marked_deleted': 0}
+
+                # Join each mirror to its source in one query, keeping only
+                # mirrors whose source is deleted
+                orphans = session.execute(_ORPHAN_MIRRORS_SQL).mappings().all()
 
                 orphan_stats = {
-                    'checked': len(mirrors),
-                    'orphaned': 0,
+                    'checked': checked,
+                    'orphaned': len(orphans),
                     'marked_deleted': 0
                 }
 
-                self.logger.info(f"  Checking {len(mirrors)} mirror events...")
-
-                for mirror in mirrors:
-                    source_id = mirror['source_id']
-                    source_cal = mirror['source_cal']
-
-                    if not source_id or not source_cal:
-                        continue
-
-                    # Check if source event is deleted
-                    source_deleted = session.execute(
-                        text("""
-                            SELECT deleted_at
-                            FROM calendar_events
-                            WHERE event_id = :source_id
-                            AND current_calendar = :source_cal
-                            LIMIT 1
-                        """),
-                        {'source_id': source_id, 'source_cal': source_cal}
-                    ).scalar()
-
-                    if source_deleted is not None:
-                        # Source is deleted, mark mirror for deletion
-                        self.logger.warning(
-                            f"  🔴 Orphaned mirror: '{mirror['summary']}' "
-                            f"(source deleted on {source_deleted})"
-                        )
-                        orphan_stats['orphaned'] += 1
-
-                        if not self.dry_run:
-                            # Mark mirror as deleted in database
-                            # Sync service will remove it from Google Calendar
-                            session.execute(
-                                text("""
-                                    UPDATE calendar_events
-                                    SET deleted_at = NOW(),
-                                        status = 'deleted',
-                                        last_action = 'source_deleted_orphan',
-                                        last_action_at = NOW()
-                                    WHERE event_id = :event_id
-                                    AND current_calendar = :calendar_id
-                                    AND deleted_at IS NULL
-                                """),
-                                {
-                                    'event_id': mirror['event_id'],
-                                    'calendar_id': mirror['current_calendar']
-                                }
-                            )
-                            orphan_stats['marked_deleted'] += 1
-                        else:
-                            self.logger.info(f"    🧪 DRY RUN - Would mark for deletion")
+                for mirror in orphans:
+                    self.logger.warning(
+                        f"  🔴 Orphaned mirror: '{mirror['summary']}' "
+                        f"(source deleted on {mirror['source_deleted']})"
+                    )
+
+                if orphans:
+                    if not self.dry_run:
+                        # Mark all orphaned mirrors as deleted in one statement
+                        # Sync service will remove them from Google Calendar
+                        result = session.execute(_MARK_ORPHANS_SQL)
+                        orphan_stats['marked_deleted'] = result.rowcount
+                    else:
+                        self.logger.info(f"    🧪 DRY RUN - Would mark {len(orphans)} for deletion")
 
                 if not self.dry_run:
                     session.commit()
@@ -688,31 +924,49 @@ class UnifiedCalendarSync:
         orphan_stats = self.handle_orphaned_mirrors()
         results['orphaned_mirrors'] = orphan_stats
 
-        # Step 2: Sync each calendar
-        for calendar_name, calendar_id in self.calendars_to_sync.items():
-            # Skip if calendar filter is set and doesn't match
-            if self.calendar_filter and calendar_name != self.calendar_filter:
-                self.logger.debug(f"  Skipping {calendar_name} (filtered)")
-                continue
+        # Step 2: Sync calendars concurrently; each sync is bound on Google API I/O
+        calendars = self._active_calendars
 
-            try:
-                stats = self.sync_calendar(calendar_name, calendar_id)
-                results['calendars'][calendar_name] = stats
-
-                # Update totals
-                results['totals']['events_created'] += stats.get('created', 0)
-                results['totals']['events_deleted'] += stats.get('deleted', 0)
-                results['totals']['events_updated'] += stats.get('updated', 0)
-                results['totals']['errors'] += stats.get('errors', 0)
+        with ThreadPoolExecutor(max_workers=max(1, min(self.sync_workers, len(calendars)))) as executor:
+            futures = {
+                executor.submit(self.sync_calendar, calendar_name, calendar_id): calendar_name
+                for calendar_name, calendar_id in calendars
+            }
 
-            except Exception as e:
-                self.logger.error(f"Failed to sync {calendar_name}: {e}")
-                results['calendars'][calendar_name] = {'error': str(e)}
+            for future in as_completed(futures):
+                calendar_name = futures[future]
+                try:
+                    stats = future.result()
+                    results['calendars'][calendar_name] = stats
+
+                    # Update totals
+                    results['totals']['events_created'] += stats.get('created', 0)
+                    results['totals']['events_deleted'] += stats.get('deleted', 0)
+                    results['totals']['events_updated'] += stats.get('updated', 0)
+                    results['totals']['errors'] += stats.get('errors', 0)
+
+                except Exception as e:
+                    self.logger.error(f"Failed to sync {calendar_name}: {e}")
+                    results['calendars'][calendar_name] = {'error': str(e)}
+
+        # Keep the configured calendar order in the saved results
+        results['calendars'] = {
+            calendar_name: results['calendars'][calendar_name]
+            for calendar_name, _ in calendars
+        }
 
-        # Save results
+        # Save results atomically so readers never see a half-written file
         results_file = os.path.join(PROJECT_ROOT, 'unified_sync_results.json')
-        with open(results_file, 'w') as f:
-            json.dump(results, f, indent=2, default=str)
+        tmp_file = results_file + '.tmp'
+        if orjson:
+            payload = orjson.dumps(results, option=orjson.OPT_INDENT_2, default=str)
+        else:
+            payload = json.dumps(results, indent=2, default=str).encode('utf-8')
+        with open(tmp_file, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, results_file)
 
         # Log summary
         self.logger.info("\n" + "=" * 60)
@@ -744,6 +998,8 @@ def main():
                        help='Run in LIVE mode (apply changes). Default is DRY RUN.')
     parser.add_argument('--deletions-only', action='store_true',
                        help='Only delete events, skip creation (useful for cleanup)')
+    parser.add_argument('--skip-stale', action='store_true',
+                       help='Leave stale calendar events alone (with --deletions-only, skips listing Google Calendar)')
     parser.add_argument('--batch-size', type=int,
                        help='Limit number of operations per run (prevents rate limits)')
     parser.add_argument('--calendar',
@@ -767,6 +1023,8 @@ def main():
         print("🔴 LIVE MODE - Changes will be applied to Google Calendar")
     if args.deletions_only:
         print("🗑️  DELETIONS ONLY - Will not create events")
+    if args.skip_stale:
+        print("🧹 SKIP STALE - Will not delete stale calendar events")
     if args.batch_size:
         print(f"📦 BATCH SIZE: {args.batch_size} operations")
     if args.calendar:
@@ -778,7 +1036,8 @@ def main():
         dry_run=dry_run,
         deletions_only=args.deletions_only,
         batch_size=args.batch_size,
-        calendar_filter=args.calendar
+        calendar_filter=args.calendar,
+        include_stale=not args.skip_stale
     )
     results = sync.sync_all_calendars()
 
@@ -13,6 +13,7 @@ Rules:
 - Recurring all-day events: once deleted, never re-mirror
 """
 
+import functools
 import json
 import logging
 import os
@@ -32,6 +33,14 @@ from config import *
 from calpal.core.db_manager import DatabaseManager
 
 
+@functools.lru_cache(maxsize=1)
+def _load_subcalendars() -> Dict[str, str]:
+    """Read work_subcalendars.json once per process."""
+    subcalendars_file = os.path.join(DATA_DIR, 'work_subcalendars.json')
+    with open(subcalendars_file, 'r') as f:
+        return json.load(f)
+
+
 class PersonalFamilyMirror:
     """Mirror personal and family calendar events."""
 
@@ -49,6 +58,9 @@ class PersonalFamilyMirror:
         # Load calendar IDs
         self.load_calendars()
 
+        # Per-sync memo of DB lookups: (kind, key, scope) -> result
+        self._lookup_cache: Dict[tuple, Any] = {}
+
     def _initialize_calendar_service(self):
         """Initialize Google Calendar API service."""
         try:
@@ -56,7 +68,10 @@ class PersonalFamilyMirror:
                 GOOGLE_CREDENTIALS_FILE,
                 scopes=['https://www.googleapis.com/auth/calendar']
             )
-            service = build('calendar', 'v3', credentials=credentials)
+            # Use the discovery document bundled with google-api-python-client
+            # instead of fetching/caching it at runtime
+            service = build('calendar', 'v3', credentials=credentials,
+                            cache_discovery=False, static_discovery=True)
             self.logger.info("✅ Google Calendar API service initialized")
             return service
         except Exception as e:
@@ -70,9 +85,7 @@ class PersonalFamilyMirror:
         self.work_calendar = WORK_CALENDAR_ID
 
         # Load subcalendars
-        subcalendars_file = os.path.join(DATA_DIR, 'work_subcalendars.json')
-        with open(subcalendars_file, 'r') as f:
-            subcalendars = json.load(f)
+        subcalendars = _load_subcalendars()
 
         self.personal_events = subcalendars['Personal Events']
         self.family_events = subcalendars['Family Events']
@@ -81,6 +94,10 @@ class PersonalFamilyMirror:
 
     def check_do_not_mirror(self, ical_uid: str, event_type: str) -> bool:
         """Check if event should not be mirrored (user deleted it before)."""
+        cache_key = ('do_not_mirror', ical_uid, event_type)
+        if cache_key in self._lookup_cache:
+            return self._lookup_cache[cache_key]
+
         try:
             with self.db.get_session() as session:
                 result = session.execute(
@@ -94,6 +111,7 @@ class PersonalFamilyMirror:
                     {"ical_uid": ical_uid, "event_type": event_type}
                 ).scalar()
 
+                self._lookup_cache[cache_key] = result is not None
                 return result is not None
         except Exception as e:
             self.logger.error(f"Error checking do_not_mirror: {e}")
@@ -112,33 +130,114 @@ class PersonalFamilyMirror:
                     """),
                     {"ical_uid": ical_uid, "event_type": event_type}
                 )
+                self._lookup_cache[('do_not_mirror', ical_uid, event_type)] = True
                 self.logger.info(f"Marked {ical_uid} as do_not_mirror")
         except Exception as e:
             self.logger.error(f"Error marking do_not_mirror: {e}")
 
-    def get_source_events(self, calendar_id: str, event_type: str) -> List[Dict]:
-        """Get events from database that need mirroring."""
+    def get_source_events(self, calendar_id: str, event_type: str,
+                          subcalendar: Optional[str] = None) -> List[Dict]:
+        """
+        Get events from database that need mirroring.
+
+        When subcalendar is given, each row carries a mirrors_current flag that
+        is TRUE if both the subcalendar mirror and the Work Busy mirror already
+        exist with the source's current summary and times.
+
+        The do_not_mirror and mirror-existence lookups for every row are
+        answered by the same query and primed into the lookup cache, so the
+        per-event checks in mirror_calendar don't hit the database.
+        """
         try:
             with self.db.get_session() as session:
                 results = session.execute(
                     text("""
-                        SELECT * FROM calendar_events
-                        WHERE source_calendar = :calendar_id
-                        AND event_type = :event_type
-                        AND deleted_at IS NULL
-                        AND COALESCE(do_not_mirror, FALSE) = FALSE
-                        ORDER BY start_time
+                        SELECT s.*,
+                            (
+                                :subcalendar IS NOT NULL
+                                AND EXISTS (
+                                    SELECT 1 FROM calendar_events m
+                                    WHERE m.source_event_id = s.event_id
+                                    AND m.current_calendar = :subcalendar
+                                    AND m.deleted_at IS NULL
+                                    AND m.summary = s.summary
+                                    AND m.start_time = s.start_time
+                                    AND m.end_time = s.end_time
+                                )
+                                AND EXISTS (
+                                    SELECT 1 FROM calendar_events w
+                                    WHERE w.source_event_id = s.event_id
+                                    AND w.current_calendar = :work_calendar
+                                    AND w.deleted_at IS NULL
+                                    AND w.start_time = s.start_time
+                                    AND w.end_time = s.end_time
+                                )
+                            ) AS mirrors_current,
+                            EXISTS (
+                                SELECT 1 FROM calendar_events d
+                                WHERE d.ical_uid = s.ical_uid
+                                AND d.event_type = s.event_type
+                                AND d.do_not_mirror = TRUE
+                            ) AS do_not_mirror_flagged,
+                            (
+                                SELECT m.event_id FROM calendar_events m
+                                WHERE m.source_event_id = s.event_id
+                                AND m.current_calendar = :subcalendar
+                                AND m.deleted_at IS NULL
+                                LIMIT 1
+                            ) AS subcal_mirror_id,
+                            (
+                                SELECT w.event_id FROM calendar_events w
+                                WHERE w.source_event_id = s.event_id
+                                AND w.current_calendar = :work_calendar
+                                AND w.deleted_at IS NULL
+                                LIMIT 1
+                            ) AS work_mirror_id
+                        FROM calendar_events s
+                        WHERE s.source_calendar = :calendar_id
+                        AND s.event_type = :event_type
+                        AND s.deleted_at IS NULL
+                        AND COALESCE(s.do_not_mirror, FALSE) = FALSE
+                        ORDER BY s.start_time
                     """),
-                    {"calendar_id": calendar_id, "event_type": event_type}
+                    {
+                        "calendar_id": calendar_id,
+                        "event_type": event_type,
+                        "subcalendar": subcalendar,
+                        "work_calendar": self.work_calendar
+                    }
                 ).mappings().all()
 
-                return [dict(row) for row in results]
-        except Exception as e:
-            self.logger.error(f"Error fetching source events: {e}")
-            import traceback
-            traceback.print_exc()
+                events = []
+                for row in results:
+                    event = dict(row)
+                    self._lookup_cache[('do_not_mirror', event['ical_uid'], event_type)] = \
+                        event.pop('do_not_mirror_flagged')
+                    subcal_mirror_id = event.pop('subcal_mirror_id')
+                    work_mirror_id = event.pop('work_mirror_id')
+                    if subcalendar:
+                        self._lookup_cache[('mirror', event['event_id'], subcalendar)] = subcal_mirror_id
+                        self._lookup_cache[('mirror', event['event_id'], self.work_calendar)] = work_mirror_id
+                    events.append(event)
+
+                return events
+        except Exception:
+            self.logger.exception("Error fetching source events")
             return []
 
+    @staticmethod
+    def _precompute_event_times(event: Dict):
+        """Cache formatted start/end strings on the event for reuse across mirrors."""
+        if '_start_iso' in event:
+            return
+
+        start_time = event['start_time']
+        end_time = event['end_time']
+        event['_start_iso'] = start_time.isoformat()
+        event['_end_iso'] = end_time.isoformat()
+        event['_start_date'] = start_time.strftime('%Y-%m-%d')
+        event['_end_date'] = end_time.strftime('%Y-%m-%d')
+
     def create_mirror_event(self, source_event: Dict, target_calendar: str,
                            show_as_busy: bool = False) -> Optional[str]:
         """Create a mirror event on target calendar."""
@@ -153,9 +252,8 @@ class PersonalFamilyMirror:
                 description = source_event.get('description', '')
                 location = source_event.get('location', '')
 
-            # Handle times
-            start_time = source_event['start_time']
-            end_time = source_event['end_time']
+            # Handle times (formatted once per source event)
+            self._precompute_event_times(source_event)
 
             # Check if all-day event
             is_all_day = source_event.get('is_all_day', False)
@@ -165,11 +263,11 @@ class PersonalFamilyMirror:
                     'summary': summary,
                     'description': description,
                     'start': {
-                        'date': start_time.strftime('%Y-%m-%d'),
+                        'date': source_event['_start_date'],
                         'timeZone': 'America/Los_Angeles'
                     },
                     'end': {
-                        'date': end_time.strftime('%Y-%m-%d'),
+                        'date': source_event['_end_date'],
                         'timeZone': 'America/Los_Angeles'
                     }
                 }
@@ -179,11 +277,11 @@ class PersonalFamilyMirror:
                     'description': description,
                     'location': location,
                     'start': {
-                        'dateTime': start_time.isoformat(),
+                        'dateTime': source_event['_start_iso'],
                         'timeZone': 'America/Los_Angeles'
                     },
                     'end': {
-                        'dateTime': end_time.isoformat(),
+                        'dateTime': source_event['_end_iso'],
                         'timeZone': 'America/Los_Angeles'
                     }
                 }
@@ -210,48 +308,41 @@ class PersonalFamilyMirror:
             self.logger.error(f"Failed to create mirror event: {e}")
             return None
 
-    def find_mirror_on_google_calendar(self, source_event_id: str, target_calendar: str,
-                                       summary: str, start_time: datetime) -> Optional[str]:
+    def find_mirror_on_google_calendar(self, source_event_id: str,
+                                       target_calendar: str) -> Optional[str]:
         """
         Search Google Calendar for existing mirror of this source event.
         Returns event_id if found, None otherwise.
         """
         try:
-            from datetime import timedelta
-
-            # Search by time and summary
+            # Mirrors carry source_event_id in their private extended
+            # properties, so the server can return the exact match
             events_result = self.calendar_service.events().list(
                 calendarId=target_calendar,
-                timeMin=start_time.isoformat(),
-                timeMax=(start_time + timedelta(minutes=1)).isoformat(),
-                q=summary if summary != 'Busy' else '',  # Don't search for "Busy"
+                privateExtendedProperty=f"source_event_id={source_event_id}",
+                maxResults=1,
                 singleEvents=True
             ).execute()
 
             events = events_result.get('items', [])
-
-            # Check extended properties for source_event_id match
-            for event in events:
-                ext_props = event.get('extendedProperties', {})
-                private = ext_props.get('private', {})
-
-                if private.get('source_event_id') == source_event_id:
-                    return event.get('id')
-
-            return None
+            return events[0].get('id') if events else None
         except Exception as e:
             self.logger.error(f"Error searching Google Calendar: {e}")
             return None
 
     def check_mirror_exists(self, source_event_id: str, target_calendar: str) -> Optional[str]:
         """Check if mirror already exists on target calendar."""
+        cache_key = ('mirror', source_event_id, target_calendar)
+        if cache_key in self._lookup_cache:
+            return self._lookup_cache[cache_key]
+
         try:
             with self.db.get_session() as session:
                 from sqlalchemy import text
                 result = session.execute(
                     text("""
                         SELECT event_id FROM calendar_events
-                        WHERE metadata->>'source_event_id' = :source_id
+                        WHERE source_event_id = :source_id
                         AND current_calendar = :target_cal
                         AND deleted_at IS NULL
                         LIMIT 1
@@ -259,11 +350,44 @@ class PersonalFamilyMirror:
                     {"source_id": source_event_id, "target_cal": target_calendar}
                 ).scalar()
 
+                self._lookup_cache[cache_key] = result
                 return result
         except Exception as e:
             self.logger.error(f"Error checking mirror exists: {e}")
             return None
 
+    def _build_mirror_record(self, event: Dict, mirror_id: str, source_calendar: str,
+                             target_calendar: str, mirror_event_type: str,
+                             subcal_mirror_id: Optional[str] = None,
+                             is_busy: bool = False) -> Dict:
+        """Build the database record for a subcalendar or Busy work mirror."""
+        metadata = {
+            'mirror_source': source_calendar,
+            'source_event_id': event['event_id']
+        }
+        if is_busy:
+            metadata['is_busy_mirror'] = True
+            metadata['subcalendar_mirror'] = subcal_mirror_id
+        else:
+            metadata['is_mirror'] = True
+            metadata['original_summary'] = event['summary']
+
+        return {
+            'event_id': mirror_id,
+            'ical_uid': event.get('ical_uid'),
+            'summary': 'Busy' if is_busy else event['summary'],
+            'description': '' if is_busy else event.get('description', ''),
+            'location': '' if is_busy else event.get('location', ''),
+            'start_time': event['start_time'],
+            'end_time': event['end_time'],
+            'source_calendar': source_calendar,
+            'current_calendar': target_calendar,
+            'event_type': mirror_event_type,
+            'status': 'active',
+            'is_all_day': event.get('is_all_day', False),
+            'metadata': metadata
+        }
+
     def mirror_calendar(self, source_calendar: str, subcalendar: str,
                        event_type: str, calendar_name: str) -> Dict[str, int]:
         """Mirror events from source to subcalendar and work."""
@@ -272,6 +396,7 @@ class PersonalFamilyMirror:
             'subcalendar_created': 0,
             'work_created': 0,
             'already_mirrored': 0,
+            'unchanged': 0,
             'do_not_mirror': 0,
             'errors': 0
         }
@@ -279,161 +404,79 @@ class PersonalFamilyMirror:
         self.logger.info(f"🔄 Mirroring {calendar_name}...")
 
         # Get events from database
-        source_events = self.get_source_events(source_calendar, event_type)
+        source_events = self.get_source_events(source_calendar, event_type, subcalendar)
         stats['events_found'] = len(source_events)
 
         self.logger.info(f"  Found {len(source_events)} events to process")
 
-        for event in source_events:
-            try:
-                ical_uid = event.get('ical_uid')
-                event_id = event['event_id']
-
-                # Check if marked as do_not_mirror
-                if self.check_do_not_mirror(ical_uid, event_type):
-                    stats['do_not_mirror'] += 1
-                    continue
-
-                # Use advisory lock for subcalendar mirror
-                lock_key = f"mirror:{event_id}:{subcalendar}"
-
-                with self.db.advisory_lock(lock_key):
-                    # Check if mirror exists on Google Calendar (idempotent)
-                    existing_on_google = self.find_mirror_on_google_calendar(
-                        event_id,
-                        subcalendar,
-                        event['summary'],
-                        event['start_time']
+        # Single lock for the whole calendar serialises concurrent syncs
+        with self.db.advisory_lock(f"mirror:{source_calendar}"):
+            for event in source_events:
+                try:
+                    ical_uid = event.get('ical_uid')
+                    event_id = event['event_id']
+
+                    # Check if marked as do_not_mirror
+                    if self.check_do_not_mirror(ical_uid, event_type):
+                        stats['do_not_mirror'] += 1
+                        continue
+
+                    # Both mirrors already match the source - nothing to do
+                    if event.get('mirrors_current'):
+                        stats['unchanged'] += 1
+                        continue
+
+                    # Subcalendar and work mirrors share the same formatted times
+                    self._precompute_event_times(event)
+
+                    # Check DB first; only search Google Calendar if the DB
+                    # has no record of the mirror (idempotent)
+                    existing_mirror = (
+                        self.check_mirror_exists(event_id, subcalendar)
+                        or self.find_mirror_on_google_calendar(event_id, subcalendar)
+                    )
+                    subcal_mirror_id = existing_mirror or self.create_mirror_event(
+                        event, subcalendar, show_as_busy=False
                     )
 
-                    if existing_on_google:
-                        # Mirror already exists, ensure it's in database
-                        subcal_mirror_id = existing_on_google
-                        mirror_data = {
-                            'event_id': subcal_mirror_id,
-                            'ical_uid': ical_uid,
-                            'summary': event['summary'],
-                            'description': event.get('description', ''),
-                            'location': event.get('location', ''),
-                            'start_time': event['start_time'],
-                            'end_time': event['end_time'],
-                            'source_calendar': source_calendar,
-                            'current_calendar': subcalendar,
-                            'event_type': f"{event_type}_mirror",
-                            'status': 'active',
-                            'is_all_day': event.get('is_all_day', False),
-                            'metadata': {
-                                'mirror_source': source_calendar,
-                                'source_event_id': event_id,
-                                'is_mirror': True,
-                                'original_summary': event['summary']
-                            }
-                        }
-                        self.db.upsert_mirror_event(mirror_data)
-                        stats['already_mirrored'] += 1
-                    else:
-                        # Create new mirror
-                        subcal_mirror_id = self.create_mirror_event(
-                            event, subcalendar, show_as_busy=False
-                        )
-
-                        if subcal_mirror_id:
-                            mirror_data = {
-                                'event_id': subcal_mirror_id,
-                                'ical_uid': ical_uid,
-                                'summary': event['summary'],
-                                'description': event.get('description', ''),
-                                'location': event.get('location', ''),
-                                'start_time': event['start_time'],
-                                'end_time': event['end_time'],
-                                'source_calendar': source_calendar,
-                                'current_calendar': subcalendar,
-                                'event_type': f"{event_type}_mirror",
-                                'status': 'active',
-                                'is_all_day': event.get('is_all_day', False),
-                                'metadata': {
-                                    'mirror_source': source_calendar,
-                                    'source_event_id': event_id,
-                                    'is_mirror': True,
-                                    'original_summary': event['summary']
-                                }
-                            }
-                            self.db.upsert_mirror_event(mirror_data)
-                            stats['subcalendar_created'] += 1
+                    if subcal_mirror_id:
+                        self.db.upsert_mirror_event(self._build_mirror_record(
+                            event, subcal_mirror_id, source_calendar, subcalendar,
+                            f"{event_type}_mirror"
+                        ))
+                        if existing_mirror:
+                            stats['already_mirrored'] += 1
                         else:
-                            stats['errors'] += 1
-
-                # Use advisory lock for work mirror
-                work_lock_key = f"mirror:{event_id}:{self.work_calendar}"
-
-                with self.db.advisory_lock(work_lock_key):
-                    # Check if mirror exists on Google Calendar (idempotent)
-                    existing_work_on_google = self.find_mirror_on_google_calendar(
-                        event_id,
-                        self.work_calendar,
-                        'Busy',
-                        event['start_time']
+                            stats['subcalendar_created'] += 1
+                    else:
+                        stats['errors'] += 1
+
+                    # Check DB first; only search Google Calendar if the DB
+                    # has no record of the mirror (idempotent)
+                    existing_work_mirror = (
+                        self.check_mirror_exists(event_id, self.work_calendar)
+                        or self.find_mirror_on_google_calendar(event_id, self.work_calendar)
+                    )
+                    work_mirror_id = existing_work_mirror or self.create_mirror_event(
+                        event, self.work_calendar, show_as_busy=True
                     )
 
-                    if existing_work_on_google:
-                        # Mirror already exists, ensure it's in database
-                        work_data = {
-                            'event_id': existing_work_on_google,
-                            'ical_uid': ical_uid,
-                            'summary': 'Busy',
-                            'description': '',
-                            'location': '',
-                            'start_time': event['start_time'],
-                            'end_time': event['end_time'],
-                            'source_calendar': source_calendar,
-                            'current_calendar': self.work_calendar,
-                            'event_type': f"{event_type}_work_mirror",
-                            'status': 'active',
-                            'is_all_day': event.get('is_all_day', False),
-                            'metadata': {
-                                'mirror_source': source_calendar,
-                                'source_event_id': event_id,
-                                'is_busy_mirror': True,
-                                'subcalendar_mirror': subcal_mirror_id
-                            }
-                        }
-                        self.db.upsert_mirror_event(work_data)
-                        stats['already_mirrored'] += 1
-                    else:
-                        # Create new work mirror
-                        work_mirror_id = self.create_mirror_event(
-                            event, self.work_calendar, show_as_busy=True
-                        )
-
-                        if work_mirror_id:
-                            work_data = {
-                                'event_id': work_mirror_id,
-                                'ical_uid': ical_uid,
-                                'summary': 'Busy',
-                                'description': '',
-                                'location': '',
-                                'start_time': event['start_time'],
-                                'end_time': event['end_time'],
-                                'source_calendar': source_calendar,
-                                'current_calendar': self.work_calendar,
-                                'event_type': f"{event_type}_work_mirror",
-                                'status': 'active',
-                                'is_all_day': event.get('is_all_day', False),
-                                'metadata': {
-                                    'mirror_source': source_calendar,
-                                    'source_event_id': event_id,
-                                    'is_busy_mirror': True,
-                                    'subcalendar_mirror': subcal_mirror_id
-                                }
-                            }
-                            self.db.upsert_mirror_event(work_data)
-                            stats['work_created'] += 1
+                    if work_mirror_id:
+                        self.db.upsert_mirror_event(self._build_mirror_record(
+                            event, work_mirror_id, source_calendar, self.work_calendar,
+                            f"{event_type}_work_mirror",
+                            subcal_mirror_id=subcal_mirror_id, is_busy=True
+                        ))
+                        if existing_work_mirror:
+                            stats['already_mirrored'] += 1
                         else:
-                            stats['errors'] += 1
+                            stats['work_created'] += 1
+                    else:
+                        stats['errors'] += 1
 
-            except Exception as e:
-                self.logger.error(f"Error processing event {event.get('summary', 'Unknown')}: {e}")
-                stats['errors'] += 1
+                except Exception as e:
+                    self.logger.error(f"Error processing event {event.get('summary', 'Unknown')}: {e}")
+                    stats['errors'] += 1
 
         return stats
 
@@ -441,6 +484,9 @@ class PersonalFamilyMirror:
         """Run complete mirror synchronization."""
         self.logger.info("🚀 Starting Personal/Family mirror sync...")
 
+        # DB state may have changed since the last run
+        self._lookup_cache.clear()
+
         results = {
             'timestamp': datetime.now().isoformat(),
             'mirrors': {}
@@ -473,6 +519,7 @@ class PersonalFamilyMirror:
             self.logger.info(f"  Subcalendar created: {stats['subcalendar_created']}")
             self.logger.info(f"  Work created: {stats['work_created']}")
             self.logger.info(f"  Already mirrored: {stats['already_mirrored']}")
+            self.logger.info(f"  Unchanged: {stats['unchanged']}")
             self.logger.info(f"  Do not mirror: {stats['do_not_mirror']}")
             self.logger.info(f"  Errors: {stats['errors']}")
 
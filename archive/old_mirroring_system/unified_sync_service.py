@@ -18,27 +18,31 @@ import time
 import signal
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from threading import Thread, Event
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config import *
 from calpal.core.db_manager import DatabaseManager
-from calpal.sync.twentyfive_live_sync import DBAware25LiveSync
-from calpal.sync.calendar_scanner import CalendarScanner
-from calpal.organizers.mirror_manager import PersonalFamilyMirror
-from calpal.organizers.event_organizer import WorkEventOrganizer
-from calpal.organizers.subcalendar_sync import SubcalendarWorkSync
-from calpal.generators.ics_generator import DBWifeICSGenerator
-from calpal.organizers.reconciler import WorkCalendarReconciler
+
+# Google Calendar batch requests accept at most 50 calls
+BATCH_SIZE = 50
 
 
 class UnifiedCalPalService:
     """Unified service coordinating all CalPal components."""
 
+    # Calendars checked for duplicates - load from config
+    DUPLICATE_CHECK_CALENDARS = {
+        'Work': WORK_CALENDAR_ID,
+        'GFU Events': os.getenv('GFU_EVENTS_CALENDAR_ID', ''),
+        'Classes': os.getenv('CLASSES_CALENDAR_ID', '')
+    }
+
     def __init__(self):
         self.logger = logging.getLogger('unified-calpal')
 
@@ -72,6 +76,10 @@ class UnifiedCalPalService:
         # Component instances (lazy loaded)
         self.components = {}
 
+        # Google Calendar service for the duplicate check (lazy loaded)
+        self._calendar_credentials = None
+        self._calendar_service = None
+
         # Initialize database connection check
         self.db = DatabaseManager(DATABASE_URL)
         if not self.db.test_connection():
@@ -80,23 +88,30 @@ class UnifiedCalPalService:
         self.logger.info("✅ Unified CalPal Service initialized")
 
     def _get_component(self, name: str):
-        """Lazy load component instances."""
+        """Lazy load component instances (and their modules)."""
         if name not in self.components:
             self.logger.info(f"Initializing component: {name}")
 
             if name == '25live_sync':
+                from calpal.sync.twentyfive_live_sync import DBAware25LiveSync
                 self.components[name] = DBAware25LiveSync()
             elif name == 'calendar_scan':
+                from calpal.sync.calendar_scanner import CalendarScanner
                 self.components[name] = CalendarScanner()
             elif name == 'personal_family':
+                from calpal.organizers.mirror_manager import PersonalFamilyMirror
                 self.components[name] = PersonalFamilyMirror()
             elif name == 'work_organizer':
+                from calpal.organizers.event_organizer import WorkEventOrganizer
                 self.components[name] = WorkEventOrganizer()
             elif name == 'subcalendar_sync':
+                from calpal.organizers.subcalendar_sync import SubcalendarWorkSync
                 self.components[name] = SubcalendarWorkSync()
             elif name == 'wife_ics':
+                from calpal.generators.ics_generator import DBWifeICSGenerator
                 self.components[name] = DBWifeICSGenerator()
             elif name == 'work_reconciler':
+                from calpal.organizers.reconciler import WorkCalendarReconciler
                 self.components[name] = WorkCalendarReconciler()
 
             self.logger.info(f"✅ Component initialized: {name}")
@@ -111,6 +126,15 @@ class UnifiedCalPalService:
 
         return now - last_run >= interval
 
+    def seconds_until_next_run(self) -> float:
+        """Seconds until the next component is due (negative if one is overdue)."""
+        now = datetime.now()
+        next_due = min(
+            self.last_run[component] + timedelta(seconds=interval)
+            for component, interval in self.intervals.items()
+        )
+        return (next_due - now).total_seconds()
+
     def run_25live_sync(self) -> Dict[str, Any]:
         """Run 25Live sync."""
         try:
@@ -230,28 +254,108 @@ class UnifiedCalPalService:
             traceback.print_exc()
             return {'error': str(e)}
 
+    def _delete_events_batched(self, service, cal_id: str, event_ids: List[str]) -> int:
+        """
+        Delete events from a calendar in batch requests of up to BATCH_SIZE.
+
+        Rate-limited deletes are retried in a follow-up batch with
+        exponential backoff. Returns the number of events removed.
+        """
+        from googleapiclient.errors import HttpError
+
+        removed = []
+        pending = event_ids
+        retries = 2
+
+        for attempt in range(retries + 1):
+            if not pending:
+                break
+            if attempt:
+                wait = 2 ** attempt
+                self.logger.warning(f"    Rate limit hit, retrying {len(pending)} deletes in {wait} seconds...")
+                time.sleep(wait)
+
+            retry = []
+
+            def on_delete(request_id, response, exception):
+                if exception is None:
+                    removed.append(request_id)
+                elif (attempt < retries and isinstance(exception, HttpError)
+                      and (exception.resp.status == 429 or 'rateLimitExceeded' in str(exception))):
+                    retry.append(request_id)
+                else:
+                    self.logger.error(f"Error deleting {request_id}: {exception}")
+
+            for start in range(0, len(pending), BATCH_SIZE):
+                batch = service.new_batch_http_request(callback=on_delete)
+                for event_id in pending[start:start + BATCH_SIZE]:
+                    batch.add(
+                        service.events().delete(calendarId=cal_id, eventId=event_id),
+                        request_id=event_id
+                    )
+                try:
+                    batch.execute()
+                except Exception as e:
+                    self.logger.error(f"Error deleting duplicates batch: {e}")
+
+            pending = retry
+
+        return len(removed)
+
+    def _scan_calendar_for_dupes(self, cal_name: str, cal_id: str,
+                                 time_min: str, time_max: str) -> List[Dict]:
+        """
+        Fetch upcoming events from one calendar for the duplicate check.
+
+        Runs on a worker thread, so the request uses its own authorized HTTP
+        connection; the service's shared httplib2 connection is not thread-safe.
+        """
+        import google_auth_httplib2
+        import httplib2
+
+        self.logger.info(f"  Checking {cal_name}...")
+
+        http = google_auth_httplib2.AuthorizedHttp(self._calendar_credentials, http=httplib2.Http())
+        events = []
+        page_token = None
+
+        while True:
+            events_result = self._calendar_service.events().list(
+                calendarId=cal_id,
+                timeMin=time_min,
+                timeMax=time_max,
+                maxResults=2500,
+                singleEvents=True,
+                pageToken=page_token,
+                fields='items(id,summary,created,start(dateTime,date)),nextPageToken'
+            ).execute(http=http)
+
+            events.extend(events_result.get('items', []))
+
+            page_token = events_result.get('nextPageToken')
+            if not page_token:
+                return events
+
     def run_duplicate_check(self) -> Dict[str, Any]:
         """Check for and clean up duplicate events."""
         try:
             from google.oauth2.service_account import Credentials
             from googleapiclient.discovery import build
-            from collections import defaultdict
 
             self.logger.info("🔍 Checking for duplicate events...")
 
-            # Initialize Google Calendar
-            credentials = Credentials.from_service_account_file(
-                GOOGLE_CREDENTIALS_FILE,
-                scopes=['https://www.googleapis.com/auth/calendar']
-            )
-            service = build('calendar', 'v3', credentials=credentials)
-
-            # Calendars to check - load from config
-            calendars = {
-                'Work': WORK_CALENDAR_ID,
-                'GFU Events': os.getenv('GFU_EVENTS_CALENDAR_ID', ''),
-                'Classes': os.getenv('CLASSES_CALENDAR_ID', '')
-            }
+            # Initialize Google Calendar once; the service is reused every hour
+            if self._calendar_service is None:
+                credentials = Credentials.from_service_account_file(
+                    GOOGLE_CREDENTIALS_FILE,
+                    scopes=['https://www.googleapis.com/auth/calendar']
+                )
+                self._calendar_service = build('calendar', 'v3', credentials=credentials,
+                                               cache_discovery=False, static_discovery=True)
+                self._calendar_credentials = credentials
+            service = self._calendar_service
+
+            calendars = self.DUPLICATE_CHECK_CALENDARS
 
             results = {
                 'duplicates_found': 0,
@@ -259,50 +363,43 @@ class UnifiedCalPalService:
                 'calendars_checked': []
             }
 
-            for cal_name, cal_id in calendars.items():
-                self.logger.info(f"  Checking {cal_name}...")
-
-                # Fetch events
-                events_result = service.events().list(
-                    calendarId=cal_id,
-                    timeMin=datetime.now().isoformat() + 'Z',
-                    timeMax=(datetime.now() + timedelta(days=365)).isoformat() + 'Z',
-                    maxResults=2500,
-                    singleEvents=True
-                ).execute()
+            # Fetch all calendars concurrently; grouping and deletes stay on this thread
+            time_min = datetime.now().isoformat() + 'Z'
+            time_max = (datetime.now() + timedelta(days=365)).isoformat() + 'Z'
+            with ThreadPoolExecutor(max_workers=len(calendars)) as executor:
+                scans = {
+                    cal_name: executor.submit(self._scan_calendar_for_dupes, cal_name, cal_id, time_min, time_max)
+                    for cal_name, cal_id in calendars.items()
+                }
 
-                events = events_result.get('items', [])
+            for cal_name, cal_id in calendars.items():
+                events = scans[cal_name].result()
 
-                # Group by (summary, start_time)
-                by_key = defaultdict(list)
+                # Group by (summary, start_time); first occurrences stay in
+                # seen, and only repeated keys get a list in dupes
+                seen = {}
+                dupes = {}
                 for event in events:
-                    summary = event.get('summary', 'No Title')
                     start = event.get('start', {})
-                    start_time = start.get('dateTime', start.get('date', 'unknown'))
-                    key = (summary, start_time)
-                    by_key[key].append(event)
+                    key = (event.get('summary', 'No Title'), start.get('dateTime', start.get('date', 'unknown')))
+                    first = seen.get(key)
+                    if first is None:
+                        seen[key] = event
+                    elif key in dupes:
+                        dupes[key].append(event)
+                    else:
+                        dupes[key] = [first, event]
 
                 # Find and cleanup duplicates
-                duplicates_in_cal = 0
-                removed_in_cal = 0
-
-                for (summary, start_time), evts in by_key.items():
-                    if len(evts) > 1:
-                        duplicates_in_cal += 1
-
-                        # Keep oldest, delete rest
-                        evts_sorted = sorted(evts, key=lambda e: e.get('created', ''))
-
-                        for evt in evts_sorted[1:]:
-                            try:
-                                service.events().delete(
-                                    calendarId=cal_id,
-                                    eventId=evt['id']
-                                ).execute()
-                                removed_in_cal += 1
-                                time.sleep(0.5)  # Rate limiting
-                            except Exception as e:
-                                self.logger.error(f"Error deleting {evt['id']}: {e}")
+                duplicates_in_cal = len(dupes)
+                to_delete = []
+
+                for evts in dupes.values():
+                    # Keep oldest, delete rest
+                    evts_sorted = sorted(evts, key=lambda e: e.get('created', ''))
+                    to_delete.extend(evt['id'] for evt in evts_sorted[1:])
+
+                removed_in_cal = self._delete_events_batched(service, cal_id, to_delete)
 
                 results['duplicates_found'] += duplicates_in_cal
                 results['duplicates_removed'] += removed_in_cal
@@ -374,19 +471,20 @@ class UnifiedCalPalService:
         else:
             self.logger.info(f"⏸️  No components due to run (cycle: {cycle_duration:.1f}s)")
 
-        # Show next run times
-        self.logger.info("\n📅 Next scheduled runs:")
-        for component, last_run in sorted(self.last_run.items()):
-            interval = timedelta(seconds=self.intervals[component])
-            next_run = last_run + interval
-            time_until = next_run - datetime.now()
-
-            if time_until.total_seconds() < 0:
-                self.logger.info(f"   {component}: NOW (overdue)")
-            else:
-                minutes = int(time_until.total_seconds() / 60)
-                seconds = int(time_until.total_seconds() % 60)
-                self.logger.info(f"   {component}: in {minutes}m {seconds}s")
+        # Show next run times (debug only - logged every cycle)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("\n📅 Next scheduled runs:")
+            for component, last_run in sorted(self.last_run.items()):
+                interval = timedelta(seconds=self.intervals[component])
+                next_run = last_run + interval
+                time_until = next_run - datetime.now()
+
+                if time_until.total_seconds() < 0:
+                    self.logger.debug(f"   {component}: NOW (overdue)")
+                else:
+                    minutes = int(time_until.total_seconds() / 60)
+                    seconds = int(time_until.total_seconds() % 60)
+                    self.logger.debug(f"   {component}: in {minutes}m {seconds}s")
 
         self.logger.info("=" * 60 + "\n")
 
@@ -403,11 +501,12 @@ class UnifiedCalPalService:
         # Run initial cycle immediately
         self.run_cycle()
 
-        # Main loop - check every 30 seconds
+        # Main loop - sleep until the next component is due
         while not self.shutdown_event.is_set():
             try:
-                # Sleep for 30 seconds
-                if self.shutdown_event.wait(30):
+                # Components that failed stay overdue; retry those every 30 seconds
+                wait = self.seconds_until_next_run()
+                if self.shutdown_event.wait(max(wait, 1) if wait > 0 else 30):
                     break
 
                 # Run cycle if any component is due
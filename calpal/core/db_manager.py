@@ -6,8 +6,10 @@ Handles all database operations for tracking calendar events
 across CalPal's managed calendars.
 """
 
+import json
 import os
 import sys
+import zlib
 from datetime import datetime
 from typing import Dict, List, Optional
 from contextlib import contextmanager
@@ -20,6 +22,20 @@ import logging
 # Add parent directory to path for config import
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+_INSERT_EVENT_SQL = text("""
+    INSERT INTO calendar_events (
+        event_id, ical_uid, summary, description, location,
+        start_time, end_time, source_calendar, current_calendar,
+        event_type, is_attendee_event, organizer_email,
+        creator_email, status, last_action, last_seen_at, metadata
+    ) VALUES (
+        :event_id, :ical_uid, :summary, :description, :location,
+        :start_time, :end_time, :source_calendar, :current_calendar,
+        :event_type, :is_attendee_event, :organizer_email,
+        :creator_email, :status, :last_action, NOW(), CAST(:metadata AS jsonb)
+    )
+""")
+
 class DatabaseManager:
     """Manages database connections and queries for CalPal event tracking."""
 
@@ -68,8 +84,9 @@ class DatabaseManager:
         Acquire PostgreSQL advisory lock for the duration of the context.
         Prevents concurrent execution of critical sections.
         """
-        # Convert key to 32-bit integer for PostgreSQL
-        lock_id = hash(key) % (2**31 - 1)
+        # Convert key to 32-bit integer for PostgreSQL (crc32 is stable
+        # across processes, unlike the per-process salted str hash)
+        lock_id = zlib.crc32(key.encode()) % (2**31 - 1)
 
         session = self.SessionLocal()
         try:
@@ -238,43 +255,7 @@ class DatabaseManager:
                     self.logger.debug(f"Updated event {event_data['event_id']}")
                 else:
                     # Insert new event
-                    import json
-                    from sqlalchemy import cast
-                    from sqlalchemy.dialects.postgresql import JSONB
-
-                    session.execute(
-                        text("""
-                            INSERT INTO calendar_events (
-                                event_id, ical_uid, summary, description, location,
-                                start_time, end_time, source_calendar, current_calendar,
-                                event_type, is_attendee_event, organizer_email,
-                                creator_email, status, last_action, last_seen_at, metadata
-                            ) VALUES (
-                                :event_id, :ical_uid, :summary, :description, :location,
-                                :start_time, :end_time, :source_calendar, :current_calendar,
-                                :event_type, :is_attendee_event, :organizer_email,
-                                :creator_email, :status, :last_action, NOW(), CAST(:metadata AS jsonb)
-                            )
-                        """),
-                        {
-                            "event_id": event_data['event_id'],
-                            "ical_uid": event_data.get('ical_uid'),
-                            "summary": event_data.get('summary'),
-                            "description": event_data.get('description'),
-                            "location": event_data.get('location'),
-                            "start_time": event_data.get('start_time'),
-                            "end_time": event_data.get('end_time'),
-                            "source_calendar": event_data.get('source_calendar'),
-                            "current_calendar": event_data.get('current_calendar'),
-                            "event_type": event_data.get('event_type', 'other'),
-                            "is_attendee_event": event_data.get('is_attendee_event', False),
-                            "organizer_email": event_data.get('organizer_email'),
-                            "creator_email": event_data.get('creator_email'),
-                            "status": event_data.get('status', 'active'),
-                            "last_action": event_data.get('last_action', 'created'),
-                            "metadata": json.dumps(event_data.get('metadata', {}))
-                        }
-                    )
+                    session.execute(_INSERT_EVENT_SQL, self._insert_params(event_data))
                     self.logger.debug(f"Inserted new event {event_data['event_id']}")
 
                 return True
@@ -282,6 +263,47 @@ class DatabaseManager:
             self.logger.error(f"Error recording event: {e}")
             return False
 
+    @staticmethod
+    def _insert_params(event_data: Dict) -> Dict:
+        """Bind parameters for _INSERT_EVENT_SQL."""
+        return {
+            "event_id": event_data['event_id'],
+            "ical_uid": event_data.get('ical_uid'),
+            "summary": event_data.get('summary'),
+            "description": event_data.get('description'),
+            "location": event_data.get('location'),
+            "start_time": event_data.get('start_time'),
+            "end_time": event_data.get('end_time'),
+            "source_calendar": event_data.get('source_calendar'),
+            "current_calendar": event_data.get('current_calendar'),
+            "event_type": event_data.get('event_type', 'other'),
+            "is_attendee_event": event_data.get('is_attendee_event', False),
+            "organizer_email": event_data.get('organizer_email'),
+            "creator_email": event_data.get('creator_email'),
+            "status": event_data.get('status', 'active'),
+            "last_action": event_data.get('last_action', 'created'),
+            "metadata": json.dumps(event_data.get('metadata', {}))
+        }
+
+    def record_events(self, events: List[Dict]) -> int:
+        """Record events just created on Google Calendar in one transaction.
+
+        Their event IDs are new, so no existence check is needed. If the bulk
+        insert fails, each event is recorded with record_event instead so one
+        bad row doesn't lose the rest. Returns the number recorded.
+        """
+        if not events:
+            return 0
+
+        try:
+            with self.get_session() as session:
+                session.execute(_INSERT_EVENT_SQL, [self._insert_params(e) for e in events])
+            self.logger.debug(f"Inserted {len(events)} new events")
+            return len(events)
+        except Exception as e:
+            self.logger.warning(f"Bulk insert failed, recording events individually: {e}")
+            return sum(1 for event_data in events if self.record_event(event_data))
+
     def upsert_mirror_event(self, event_data: Dict) -> bool:
         """
         Insert or update a mirror event atomically.
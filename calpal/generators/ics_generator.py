@@ -12,6 +12,7 @@ Generates ICS file from database events with filtering rules:
 Architecture: Single work calendar with color-coded events.
 """
 
+import hashlib
 import json
 import logging
 import os
@@ -43,6 +44,7 @@ class DBWifeICSGenerator:
 
         # Output configuration
         self.ics_output_path = ICS_FILE_PATH
+        self.hash_path = self.ics_output_path + '.last_hash'
         self.public_url = os.getenv('PUBLIC_ICS_URL', f"https://example.com/{os.getenv('SECURE_ENDPOINT_PATH', 'secure')}/schedule.ics")
 
         # Source calendars to exclude
@@ -203,6 +205,32 @@ class DBWifeICSGenerator:
 
         return ics_content
 
+    @staticmethod
+    def _content_hash(ics_content: str) -> str:
+        """Hash ICS content, ignoring lines that change on every generation.
+
+        DTSTAMP is stamped with the generation time and LAST-MODIFIED follows
+        updated_at, which the scanner bumps on every pass, so neither says
+        anything about whether the calendar itself changed.
+        """
+        digest = hashlib.sha256()
+        for line in ics_content.splitlines():
+            if line.startswith(('DTSTAMP', 'LAST-MODIFIED')):
+                continue
+            digest.update(line.encode('utf-8'))
+            digest.update(b'\n')
+        return digest.hexdigest()
+
+    def _read_last_hash(self) -> Optional[str]:
+        """Return the hash of the last ICS file written, if any."""
+        if not os.path.exists(self.ics_output_path):
+            return None
+        try:
+            with open(self.hash_path, 'r') as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
     def save_ics_file(self, ics_content: str, events_count: int):
         """Save ICS content to file."""
         try:
@@ -309,8 +337,21 @@ class DBWifeICSGenerator:
         else:
             self.logger.info(f"Generated ICS content: {len(ics_content)} bytes")
 
+        # Skip the write (and Flask restart) when nothing has changed
+        content_hash = self._content_hash(ics_content)
+        if content_hash == self._read_last_hash():
+            self.logger.info("✓ ICS content unchanged - skipping write")
+            return {
+                'events_count': len(events),
+                'file_size_bytes': len(ics_content),
+                'unchanged': True
+            }
+
         # Save to file
         metadata = self.save_ics_file(ics_content, len(events))
+        with open(self.hash_path, 'w') as f:
+            f.write(content_hash)
+        metadata['unchanged'] = False
 
         # Summary
         self.logger.info("=" * 60)
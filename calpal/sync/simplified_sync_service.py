@@ -43,6 +43,12 @@ class SimplifiedCalPalService:
             'ics_generator': {'interval': 5, 'last_run': None}
         }
 
+        # ICS generator backs off while its output is unchanged
+        self.ics_base_interval = self.schedules['ics_generator']['interval']
+        self.ics_max_interval = 60
+        self.ics_unchanged_cycles = 0
+        self.ics_backoff_after = 3
+
     def should_run(self, component: str) -> bool:
         """Check if component should run based on schedule."""
         schedule = self.schedules.get(component)
@@ -111,9 +117,20 @@ class SimplifiedCalPalService:
             generator = DBWifeICSGenerator()
             metadata = generator.run_generation()
 
-            self.logger.info(f"✅ ICS generated: {metadata.get('events_count', 0)} events")
+            schedule = self.schedules['ics_generator']
+            if metadata.get('unchanged'):
+                self.ics_unchanged_cycles += 1
+                if (self.ics_unchanged_cycles >= self.ics_backoff_after
+                        and schedule['interval'] < self.ics_max_interval):
+                    schedule['interval'] = min(schedule['interval'] * 2, self.ics_max_interval)
+                    self.logger.info(f"💤 ICS unchanged for {self.ics_unchanged_cycles} runs - "
+                                     f"interval now {schedule['interval']} min")
+            else:
+                self.logger.info(f"✅ ICS generated: {metadata.get('events_count', 0)} events")
+                self.ics_unchanged_cycles = 0
+                schedule['interval'] = self.ics_base_interval
 
-            self.schedules['ics_generator']['last_run'] = datetime.now()
+            schedule['last_run'] = datetime.now()
 
         except Exception as e:
             self.logger.error(f"❌ ICS generation failed: {e}")
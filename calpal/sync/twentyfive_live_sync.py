@@ -22,16 +22,31 @@ Date Range: August 1, 2024 to 12 months forward from today
 import json
 import logging
 import os
+import re
 import requests
 import base64
 import sys
+import threading
 import time
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from collections import deque
+from functools import lru_cache, partial
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Any, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from requests.adapters import HTTPAdapter
+from sqlalchemy import text
+from urllib3.util.retry import Retry
+
+try:
+    import orjson  # Optional: faster JSON for 25Live responses and results
+except ImportError:
+    orjson = None
 
 # Add parent directory to path for config import
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -39,6 +54,48 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import *
 from calpal.core.db_manager import DatabaseManager
 
+# Calendar API accepts at most 50 requests per batch
+BATCH_SIZE = 50
+
+_DIGIT_RE = re.compile(r'\d')
+
+# Summary icons indexed by success
+_STATUS_ICONS = ("❌", "✅")
+
+# Naive times probed against the database in load_existing_events (one per DST side)
+_ROUND_TRIP_PROBES = (datetime(2024, 1, 15, 9, 0), datetime(2024, 7, 15, 9, 0))
+
+
+def _session_zone(name: Optional[str]) -> ZoneInfo:
+    """Resolve the database session's TimeZone setting, defaulting to UTC."""
+    try:
+        return ZoneInfo(name or 'UTC')
+    except (ValueError, ZoneInfoNotFoundError):
+        return ZoneInfo('UTC')
+
+
+def _utc(start_time: datetime, naive_zone: ZoneInfo) -> datetime:
+    """Normalize a start time to aware UTC for existing_event_keys.
+
+    Naive 25Live times are stored into TIMESTAMPTZ as wall-clock time in the
+    database session's zone, so they are read in that same zone here; the
+    database returns aware timestamps, and naive and aware values never
+    compare equal.
+    """
+    if start_time.tzinfo is None:
+        start_time = start_time.replace(tzinfo=naive_zone)
+    return start_time.astimezone(timezone.utc)
+
+
+@lru_cache(maxsize=4096)
+def _is_reservation_profile(profile_name: str) -> bool:
+    """Check whether a 25Live profile_name looks like a reservation ID.
+
+    Recurring reservations repeat the same profile_name on every instance,
+    so this is cached for the duration of a sync.
+    """
+    return profile_name.startswith('Rsrv_') or _DIGIT_RE.search(profile_name) is not None
+
 
 class DBAware25LiveSync:
     """Database-aware 25Live to Google Calendar sync service."""
@@ -52,9 +109,49 @@ class DBAware25LiveSync:
             raise Exception("Failed to connect to database")
 
         # Initialize 25Live client
+        self.fetch_workers = 8  # Concurrent 25Live range requests per calendar type
+        self.batch_retries = 2  # Retries for rate-limited/5xx batch inserts
+        self.calendar_types = ('Classes', 'GFU Events')
         self.session = requests.Session()
         self.authenticated = False
 
+        # Keep one pooled keep-alive connection per fetch worker (across both
+        # calendar types) so concurrent range requests never open (and then
+        # discard) extra connections
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.fetch_workers * len(self.calendar_types),
+            max_retries=Retry(total=2, backoff_factor=0.5,
+                              status_forcelist=(502, 503, 504), allowed_methods=('GET',))
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        # Distinct location strings seen this sync (see _intern_location)
+        self._location_intern: Dict[str, str] = {}
+
+        # Stamped on every event created in a run (set by run_full_sync)
+        self._sync_timestamp = None
+
+        # Zone the database stores naive times in (set by load_existing_events)
+        self._db_zone = ZoneInfo('UTC')
+
+        # (date, ranges) memo for generate_date_ranges
+        self._date_ranges = None
+
+        # Calendar types sync concurrently (see run_full_sync): the index lock
+        # makes duplicate check-and-claim atomic across them, and the calendar
+        # lock serializes the (not thread-safe) httplib2 transport
+        self._index_lock = threading.Lock()
+        self._calendar_lock = threading.Lock()
+
+        # Indexes of events already on the target calendar, loaded once per
+        # sync by load_existing_events()
+        self.existing_reservation_ids = None
+        self.existing_event_keys = None
+        self.deleted_reservation_ids = None
+        self.deleted_25live_event_ids = None
+
         # Initialize Google Calendar service
         self.calendar_service = self._initialize_calendar_service()
 
@@ -72,7 +169,8 @@ class DBAware25LiveSync:
                 GOOGLE_CREDENTIALS_FILE,
                 scopes=['https://www.googleapis.com/auth/calendar']
             )
-            service = build('calendar', 'v3', credentials=credentials)
+            service = build('calendar', 'v3', credentials=credentials,
+                            cache_discovery=False, static_discovery=True)
             self.logger.info("✅ Google Calendar API service initialized")
             return service
         except Exception as e:
@@ -87,6 +185,14 @@ class DBAware25LiveSync:
                 if len(lines) >= 2:
                     self.username = lines[0]
                     self.password = lines[1]
+
+                    # Send credentials with every request so an expired
+                    # session cookie mid-sync doesn't fail the remaining ranges
+                    credentials = base64.b64encode(f"{self.username}:{self.password}".encode()).decode()
+                    self.session.headers.update({
+                        'Authorization': f'Basic {credentials}',
+                        'Accept': 'application/json, text/plain, */*'
+                    })
                     self.logger.info("✅ Loaded 25Live credentials")
                 else:
                     raise ValueError("Invalid credentials format")
@@ -123,13 +229,13 @@ class DBAware25LiveSync:
 
     def load_event_blacklist(self):
         """Load event blacklist from event_blacklist.json."""
+        self._blacklist_verdicts: Dict[str, bool] = {}
         try:
-            import re
             blacklist_file = os.path.join(DATA_DIR, 'event_blacklist.json')
             with open(blacklist_file, 'r') as f:
                 blacklist_data = json.load(f)
 
-            self.blacklisted_events = set(blacklist_data.get('blacklisted_events', []))
+            self.blacklisted_events = frozenset(blacklist_data.get('blacklisted_events', []))
             self.blacklist_patterns = [
                 re.compile(pattern)
                 for pattern in blacklist_data.get('blacklist_patterns', [])
@@ -138,57 +244,112 @@ class DBAware25LiveSync:
             self.logger.info(f"✅ Loaded event blacklist ({len(self.blacklisted_events)} exact matches, {len(self.blacklist_patterns)} patterns)")
         except FileNotFoundError:
             self.logger.warning("⚠️  No event blacklist file found, allowing all events")
-            self.blacklisted_events = set()
+            self.blacklisted_events = frozenset()
             self.blacklist_patterns = []
         except Exception as e:
             self.logger.error(f"❌ Failed to load event blacklist: {e}")
-            self.blacklisted_events = set()
+            self.blacklisted_events = frozenset()
             self.blacklist_patterns = []
 
-    def is_event_blacklisted(self, summary: str) -> bool:
-        """Check if event summary is blacklisted."""
-        # Check exact matches
-        if summary in self.blacklisted_events:
-            return True
-
-        # Check pattern matches
-        for pattern in self.blacklist_patterns:
-            if pattern.search(summary):
-                return True
+        # Combine patterns into one alternation so each title is scanned once
+        self.blacklist_regex = None
+        if self.blacklist_patterns:
+            try:
+                self.blacklist_regex = re.compile(
+                    '|'.join(f'(?:{pattern.pattern})' for pattern in self.blacklist_patterns)
+                )
+            except re.error:
+                # e.g. inline flags that can't be combined - check one by one
+                self.logger.debug("Blacklist patterns can't be combined, checking individually")
 
-        return False
+    def is_event_blacklisted(self, summary: str) -> bool:
+        """Check if event summary is blacklisted.
 
-    def check_deleted_event(self, reservation_id: str, event_id: str, calendar_id: str) -> bool:
-        """Check if an event with this reservation_id OR event_id was previously deleted.
+        Recurring reservations repeat the same title many times per sync, so
+        each title's verdict is cached after the first check.
+        """
+        verdict = self._blacklist_verdicts.get(summary)
+        if verdict is not None:
+            return verdict
 
-        CRITICAL FIX: Some events have event_id but null reservation_id.
-        Must check BOTH to prevent infinite re-creation.
+        # Check exact matches, then pattern matches
+        if summary in self.blacklisted_events:
+            verdict = True
+        elif self.blacklist_regex is not None:
+            verdict = self.blacklist_regex.search(summary) is not None
+        else:
+            verdict = any(pattern.search(summary) for pattern in self.blacklist_patterns)
+        self._blacklist_verdicts[summary] = verdict
+        return verdict
+
+    def load_existing_events(self):
+        """Load keys of events already on the target calendar.
+
+        One query per sync replaces per-reservation lookups. Active events are
+        indexed by 25Live reservation ID, with (summary, start_time) tuples
+        backing the fallback check for events without one. Deleted events are
+        indexed by both reservation ID and 25Live event ID so they are never
+        recreated; some events have an event ID but a null reservation ID.
+        Events queued during the sync are added to the active sets as they
+        are queued.
+
+        Raises on failure: an empty index would recreate every event. Also
+        raises if naive probe times don't round-trip through the database to
+        the same keys, since the time/summary fallback would then never match.
         """
         try:
-            from sqlalchemy import text
             with self.db.get_session() as session:
-                result = session.execute(
+                rows = session.execute(
                     text("""
-                        SELECT COUNT(*) as count
+                        SELECT metadata->>'25live_reservation_id',
+                               metadata->>'25live_event_id',
+                               summary, start_time,
+                               deleted_at IS NOT NULL
                         FROM calendar_events
                         WHERE current_calendar = :calendar_id
-                        AND deleted_at IS NOT NULL
-                        AND (
-                            metadata->>'25live_reservation_id' = :reservation_id
-                            OR metadata->>'25live_event_id' = :event_id
-                        )
                     """),
-                    {
-                        "reservation_id": reservation_id,
-                        "event_id": event_id,
-                        "calendar_id": calendar_id
-                    }
-                ).fetchone()
-
-                return result[0] > 0 if result else False
+                    {"calendar_id": self.target_calendar}
+                ).fetchall()
+
+                # Naive 25Live times must key the same as the rows they become
+                zone = _session_zone(session.execute(text("SHOW TimeZone")).scalar())
+                stored = session.execute(
+                    text("SELECT CAST(:winter AS timestamptz), CAST(:summer AS timestamptz)"),
+                    {"winter": _ROUND_TRIP_PROBES[0], "summer": _ROUND_TRIP_PROBES[1]}
+                ).one()
         except Exception as e:
-            self.logger.error(f"Error checking deleted event: {e}")
-            return False
+            self.logger.error(f"Error loading existing events: {e}")
+            raise
+
+        for probe, round_tripped in zip(_ROUND_TRIP_PROBES, stored):
+            if _utc(probe, zone) != _utc(round_tripped, zone):
+                raise RuntimeError(
+                    f"Naive time {probe.isoformat()} is stored as {round_tripped.isoformat()}; "
+                    f"time/summary duplicate keys would not match"
+                )
+        self._db_zone = zone
+
+        self.existing_reservation_ids = set()
+        self.existing_event_keys = set()
+        self.deleted_reservation_ids = set()
+        self.deleted_25live_event_ids = set()
+
+        for reservation_id, event_id, summary, start_time, is_deleted in rows:
+            if is_deleted:
+                if reservation_id is not None:
+                    self.deleted_reservation_ids.add(reservation_id)
+                if event_id is not None:
+                    self.deleted_25live_event_ids.add(event_id)
+            else:
+                if reservation_id:
+                    self.existing_reservation_ids.add(reservation_id)
+                if start_time is not None:
+                    self.existing_event_keys.add((summary, _utc(start_time, zone)))
+
+        self.logger.info(f"📋 Loaded {len(self.existing_event_keys)} existing events "
+                         f"({len(self.existing_reservation_ids)} with 25Live IDs)")
+        self.logger.info(f"   Previously deleted: {len(self.deleted_reservation_ids)} reservation IDs, "
+                         f"{len(self.deleted_25live_event_ids)} event IDs")
 
     def authenticate_25live(self):
         """Authenticate with 25Live."""
@@ -196,15 +357,9 @@ class DBAware25LiveSync:
 
         challenge_url = f"{TWENTYFIVE_LIVE_BASE_URL}/25live/data/{TWENTYFIVE_LIVE_INSTITUTION}/run/login.json?caller=pro"
 
-        credentials = base64.b64encode(f"{self.username}:{self.password}".encode()).decode()
-        headers = {
-            'Authorization': f'Basic {credentials}',
-            'Content-Type': 'application/json',
-            'Accept': 'application/json, text/plain, */*'
-        }
-
         try:
-            response = self.session.get(challenge_url, headers=headers, timeout=30)
+            # Authorization and Accept are session defaults (see load_credentials)
+            response = self.session.get(challenge_url, headers={'Content-Type': 'application/json'}, timeout=30)
 
             if response.status_code == 200:
                 self.authenticated = True
@@ -222,26 +377,31 @@ class DBAware25LiveSync:
         """Generate date ranges from August 1, 2024 to 12 months forward.
 
         Respects 25Live's 20-week limit by chunking into smaller ranges.
+        The ranges depend only on today's date, so they are computed once per
+        day and shared by every calendar type.
         """
+        today = date.today()
+        if self._date_ranges is not None and self._date_ranges[0] == today:
+            return self._date_ranges[1]
+
         start_date = datetime(2024, 8, 1)
-        end_date = datetime.now() + timedelta(days=365)  # 12 months forward
+        end_date = datetime.combine(today, datetime.min.time()) + timedelta(days=365)  # 12 months forward
 
-        ranges = []
-        current = start_date
         max_range_days = 130  # 18.5 weeks = 130 days (safe under 20-week limit)
 
-        while current < end_date:
-            range_end = min(current + timedelta(days=max_range_days), end_date)
-            ranges.append((
-                current.strftime('%Y-%m-%d'),
-                range_end.strftime('%Y-%m-%d')
-            ))
-            current = range_end + timedelta(days=1)
+        # Each range starts the day after the previous one ends
+        start_ord = start_date.toordinal()
+        end_ord = end_date.toordinal()
+        ranges = [
+            (date.fromordinal(o).isoformat(), date.fromordinal(min(o + max_range_days, end_ord)).isoformat())
+            for o in range(start_ord, end_ord + 1, max_range_days + 1)
+        ]
 
         total_days = (end_date - start_date).days
         self.logger.info(f"📅 Generated {len(ranges)} date ranges covering {total_days} days")
         self.logger.info(f"   From: {start_date.strftime('%Y-%m-%d')}")
         self.logger.info(f"   To: {end_date.strftime('%Y-%m-%d')}")
+        self._date_ranges = (today, ranges)
         return ranges
 
     def fetch_reservations(self, url_fragment: str, start_date: str, end_date: str) -> List[Dict]:
@@ -273,7 +433,7 @@ class DBAware25LiveSync:
             response = self.session.get(calendar_url, params=params, timeout=30)
 
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content) if orjson else response.json()
                 reservations = data.get('reservations', {}).get('reservation', [])
                 self.logger.debug(f"Retrieved {len(reservations)} reservations for {start_date} to {end_date}")
                 return reservations
@@ -285,6 +445,25 @@ class DBAware25LiveSync:
             self.logger.error(f"Request failed: {e}")
             return []
 
+    def fetch_all_reservations(self, urls: List[str], date_ranges: List[tuple]) -> Iterator[List[Dict]]:
+        """Fetch every URL x date range concurrently, yielding results in order.
+
+        Results come back in the same order as a sequential url/range loop.
+        Only a small window of responses is held at once, so memory stays
+        bounded by the window rather than the whole sync.
+        """
+        jobs = iter([(url, start_date, end_date) for url in urls for start_date, end_date in date_ranges])
+        window = self.fetch_workers * 2
+
+        with ThreadPoolExecutor(max_workers=self.fetch_workers) as executor:
+            pending = deque(executor.submit(self.fetch_reservations, *job) for job in islice(jobs, window))
+            while pending:
+                reservations = pending.popleft().result()
+                job = next(jobs, None)
+                if job is not None:
+                    pending.append(executor.submit(self.fetch_reservations, *job))
+                yield reservations
+
     def parse_url_fragment(self, url_fragment: str) -> Dict[str, str]:
         """Parse URL fragment to extract query parameters."""
         if '&' in url_fragment:
@@ -307,10 +486,11 @@ class DBAware25LiveSync:
             return ''
 
         try:
-            if isinstance(text_data, str):
+            data_type = type(text_data)
+            if data_type is str or (data_type is not dict and isinstance(text_data, str)):
                 return text_data.strip()
 
-            if isinstance(text_data, dict):
+            if data_type is dict or isinstance(text_data, dict):
                 if text_data.get('nil'):
                     return ''
                 value = text_data.get('value', '') or text_data.get('text', '') or str(text_data)
@@ -322,16 +502,29 @@ class DBAware25LiveSync:
             self.logger.error(f"Error extracting text: {e}")
             return str(text_data)[:100] if text_data else ''
 
+    def _intern_location(self, location: str) -> str:
+        """Return the shared copy of a location string.
+
+        The same rooms repeat across a semester of reservations, so queued
+        events share one string per distinct location.
+        """
+        return self._location_intern.setdefault(location, location)
+
     def _parse_space_reservation(self, space_res: Any) -> str:
         """Parse space reservation data to extract location."""
         if not space_res:
             return ''
 
         try:
-            if isinstance(space_res, str):
+            res_type = type(space_res)
+            if res_type is str:
                 return space_res
 
-            if isinstance(space_res, list) and space_res:
+            if res_type is list:
+                # Most reservations are a single room
+                if len(space_res) == 1:
+                    return self._intern_location(self._extract_room_name(space_res[0]))
+
                 room_names = []
                 for room in space_res:
                     room_name = self._extract_room_name(room)
@@ -340,11 +533,19 @@ class DBAware25LiveSync:
 
                 if room_names:
                     if len(room_names) > 3:
-                        return f"{room_names[0]} (+ {len(room_names)-1} other locations)"
+                        return self._intern_location(f"{room_names[0]} (+ {len(room_names)-1} other locations)")
                     else:
-                        return ', '.join(room_names)
+                        return self._intern_location(', '.join(room_names))
                 return ''
 
+            if res_type is dict:
+                return self._intern_location(self._extract_room_name(space_res))
+
+            # Subclasses of the JSON types are unexpected but handled the same way
+            if isinstance(space_res, str):
+                return space_res
+            if isinstance(space_res, list):
+                return self._parse_space_reservation(list(space_res))
             if isinstance(space_res, dict):
                 return self._extract_room_name(space_res)
 
@@ -360,7 +561,8 @@ class DBAware25LiveSync:
             return ''
 
         try:
-            if isinstance(room_data, dict):
+            room_type = type(room_data)
+            if room_type is dict or (room_type is not str and isinstance(room_data, dict)):
                 if room_data.get('nil'):
                     return ''
 
@@ -382,7 +584,7 @@ class DBAware25LiveSync:
                     return building
                 return ''
 
-            if isinstance(room_data, str):
+            if room_type is str or isinstance(room_data, str):
                 return room_data
 
             return str(room_data) if room_data else ''
@@ -394,12 +596,12 @@ class DBAware25LiveSync:
     def _extract_25live_reservation_id(self, reservation: Dict) -> Optional[str]:
         """Extract 25Live Reservation ID (profile_name) from reservation."""
         profile_name = reservation.get('profile_name')
-        if profile_name and (profile_name.startswith('Rsrv_') or any(c.isdigit() for c in str(profile_name))):
+        if profile_name and _is_reservation_profile(str(profile_name)):
             # For recurring classes, include the event start date to make ID unique per instance
             start_dt = reservation.get('event_start_dt', '')
             if start_dt:
                 # Extract just the date part (YYYY-MM-DD) from the ISO datetime
-                event_date = start_dt.split('T')[0] if 'T' in start_dt else start_dt[:10]
+                event_date = start_dt.partition('T')[0] if 'T' in start_dt else start_dt[:10]
                 return f"{profile_name}_{event_date}"
             return str(profile_name)
         return None
@@ -412,8 +614,6 @@ class DBAware25LiveSync:
             return None
 
         # Extract basic info
-        event_name = self._safe_extract_text(reservation.get('event_name', ''))
-        event_title = self._safe_extract_text(reservation.get('event_title', ''))
         start_dt = reservation.get('event_start_dt', '')
         end_dt = reservation.get('event_end_dt', '')
 
@@ -421,11 +621,14 @@ class DBAware25LiveSync:
         space_res = reservation.get('space_reservation', {})
         location = self._parse_space_reservation(space_res)
 
-        # Create title based on calendar type
+        # Create title based on calendar type; the fallback field is only
+        # extracted when the preferred one is empty
         if calendar_type == 'Classes':
-            title = event_title if event_title else event_name
+            preferred, fallback = 'event_title', 'event_name'
         else:
-            title = event_name if event_name else event_title
+            preferred, fallback = 'event_name', 'event_title'
+        title = (self._safe_extract_text(reservation.get(preferred, ''))
+                 or self._safe_extract_text(reservation.get(fallback, '')))
 
         # Extract 25Live reservation ID for tracking
         reservation_id = self._extract_25live_reservation_id(reservation)
@@ -517,12 +720,27 @@ class DBAware25LiveSync:
             self.logger.error(f"Error checking Google Calendar: {e}")
             return None
 
-    def create_google_calendar_event(self, event_data: Dict) -> Optional[str]:
-        """Create event in Google Calendar with color and return the event_id."""
+    def _build_calendar_event(self, event_data: Dict) -> Dict:
+        """Build the Google Calendar event body for event data."""
         # Get color from metadata
-        color_id = event_data.get('metadata', {}).get('color_id', '1')
+        metadata = event_data.get('metadata', {})
+        color_id = metadata.get('color_id', '1')
+
+        private_props = {
+            'source': '25live',
+            'event_type': event_data['event_type'],
+            'calendar_type': metadata['calendar_type'],
+            'sync_time': self._sync_timestamp or datetime.now().isoformat()
+        }
+
+        # Carry the 25Live identity on the event itself so it can be matched
+        # by ID (privateExtendedProperty) rather than re-derived from fields
+        if metadata.get('25live_reservation_id'):
+            private_props['25live_reservation_id'] = metadata['25live_reservation_id']
+        if metadata.get('25live_event_id'):
+            private_props['25live_event_id'] = metadata['25live_event_id']
 
-        calendar_event = {
+        return {
             'summary': event_data['summary'],
             'description': event_data['description'],
             'location': event_data['location'],
@@ -536,41 +754,90 @@ class DBAware25LiveSync:
             },
             'colorId': color_id,  # Add color
             'extendedProperties': {
-                'private': {
-                    'source': '25live',
-                    'event_type': event_data['event_type'],
-                    'calendar_type': event_data['metadata']['calendar_type'],
-                    'sync_time': datetime.now().isoformat()
-                }
+                'private': private_props
             }
         }
 
-        try:
-            created_event = self.calendar_service.events().insert(
-                calendarId=event_data['current_calendar'],
-                body=calendar_event
-            ).execute()
-
-            event_id = created_event['id']
-            ical_uid = created_event.get('iCalUID')
+    @staticmethod
+    def _is_retryable(exception: Exception) -> bool:
+        """Check whether a failed batch request is worth retrying."""
+        if not isinstance(exception, HttpError):
+            return False
+        return exception.resp.status in (429, 500, 502, 503, 504) or 'rateLimitExceeded' in str(exception)
 
-            self.logger.debug(f"Created event with color {color_id}: {event_data['summary']}")
+    def _batch_cb(self, ops: List[Dict], stats: Dict[str, int], retry: Optional[List[Dict]],
+                  created: List[Dict], request_id: str, response: Dict, exception: Exception):
+        """Handle one batch insert result; created events are recorded per batch."""
+        event_data = ops[int(request_id)]
 
-            # Add small delay to avoid rate limiting
-            time.sleep(0.1)
+        if exception is not None:
+            if retry is not None and self._is_retryable(exception):
+                retry.append(event_data)
+            else:
+                self.logger.error(f"Failed to create Google Calendar event: {exception}")
+                stats['errors'] += 1
+            return
 
-            return event_id, ical_uid
+        # Recorded in database with Google Calendar ID once the batch completes
+        event_data['event_id'] = response['id']
+        event_data['ical_uid'] = response.get('iCalUID')
+        event_data['last_action'] = 'created'
+        created.append(event_data)
 
-        except HttpError as e:
-            if 'rateLimitExceeded' in str(e):
-                self.logger.warning(f"Rate limit hit, waiting 2 seconds...")
-                time.sleep(2)
-                return None, None
-            self.logger.error(f"Failed to create Google Calendar event: {e}")
-            return None, None
+    def _flush_writes(self, batch_ops: List[Dict], stats: Dict[str, int]):
+        """Create queued events on Google Calendar through batch requests.
 
-    def sync_calendar_type(self, calendar_type: str) -> Dict[str, Any]:
-        """Sync all events for a specific calendar type with database tracking."""
+        Sends at most BATCH_SIZE inserts per HTTP round-trip. Rate-limited or
+        5xx inserts are retried with exponential backoff.
+        """
+        pending = batch_ops
+        for attempt in range(self.batch_retries + 1):
+            if not pending:
+                break
+            if attempt:
+                wait = 2 ** attempt
+                self.logger.warning(f"Rate limit hit, retrying {len(pending)} events in {wait} seconds...")
+                time.sleep(wait)
+
+            retry = [] if attempt < self.batch_retries else None
+            for start in range(0, len(pending), BATCH_SIZE):
+                ops = pending[start:start + BATCH_SIZE]
+                created = []
+                batch = self.calendar_service.new_batch_http_request(
+                    callback=partial(self._batch_cb, ops, stats, retry, created)
+                )
+                for index, event_data in enumerate(ops):
+                    batch.add(
+                        self.calendar_service.events().insert(
+                            calendarId=event_data['current_calendar'],
+                            body=self._build_calendar_event(event_data),
+                            fields='id,iCalUID'  # All _batch_cb needs back
+                        ),
+                        request_id=str(index)
+                    )
+
+                try:
+                    with self._calendar_lock:
+                        batch.execute()
+                except Exception as e:
+                    self.logger.error(f"Batch insert failed: {e}")
+                    stats['errors'] += sum(1 for event_data in ops if 'event_id' not in event_data)
+
+                # One database transaction per batch instead of one per event
+                recorded = self.db.record_events(created)
+                stats['events_created'] += recorded
+                stats['errors'] += len(created) - recorded
+
+            pending = retry or []
+
+    def sync_calendar_type(self, calendar_type: str,
+                           claim_after: Optional[threading.Event] = None) -> Dict[str, Any]:
+        """Sync all events for a specific calendar type with database tracking.
+
+        With claim_after, reservations are fetched right away but not claimed
+        until that event is set, so an earlier calendar type wins any
+        reservation both return.
+        """
         self.logger.info(f"🔄 Syncing {calendar_type} events to {self.target_calendar}...")
         self.logger.info(f"   Using color: {self.color_map.get(calendar_type, '1')}")
 
@@ -584,6 +851,9 @@ class DBAware25LiveSync:
         # Get date ranges
         date_ranges = self.generate_date_ranges()
 
+        if self.existing_reservation_ids is None:
+            self.load_existing_events()
+
         stats = {
             'total_reservations': 0,
             'events_created': 0,
@@ -591,84 +861,101 @@ class DBAware25LiveSync:
             'errors': 0
         }
 
-        # Process each URL and date range
+        # Events to create on Google Calendar, sent BATCH_SIZE at a time
+        batch_ops = []
+
         for url in urls:
             url_params = self.parse_url_fragment(url)
             self.logger.info(f"  Processing URL with params: {url_params}")
 
-            for start_date, end_date in date_ranges:
-                reservations = self.fetch_reservations(url, start_date, end_date)
-                stats['total_reservations'] += len(reservations)
-
-                for reservation in reservations:
-                    try:
-                        # Convert to event data (now goes to work calendar)
-                        event_data = self.reservation_to_event_data(reservation, calendar_type)
+        # Bind hot lookups to locals for the per-reservation loop; the sets
+        # are shared with the instance and updated in place
+        to_event_data = self.reservation_to_event_data
+        is_blacklisted = self.is_event_blacklisted
+        existing_ids = self.existing_reservation_ids
+        existing_keys = self.existing_event_keys
+        db_zone = self._db_zone
+        deleted_ids = self.deleted_reservation_ids
+        deleted_event_ids = self.deleted_25live_event_ids
+        queue_event = batch_ops.append
+        index_lock = self._index_lock
+
+        # Fetch all URL/date range combinations concurrently, then process in order
+        for reservations in self.fetch_all_reservations(urls, date_ranges):
+            if claim_after is not None:
+                claim_after.wait()
+                claim_after = None
+
+            stats['total_reservations'] += len(reservations)
+
+            for reservation in reservations:
+                try:
+                    # Convert to event data (now goes to work calendar)
+                    event_data = to_event_data(reservation, calendar_type)
+
+                    if not event_data:
+                        stats['errors'] += 1
+                        continue
 
-                        if not event_data:
-                            stats['errors'] += 1
-                            continue
+                    summary = event_data['summary']
+                    start_time = event_data['start_time']
 
-                        if not event_data.get('start_time') or not event_data.get('end_time'):
-                            self.logger.warning(f"Skipping event with invalid times: {event_data.get('summary', 'Unknown')}")
-                            stats['errors'] += 1
-                            continue
+                    if not start_time or not event_data['end_time']:
+                        self.logger.warning(f"Skipping event with invalid times: {summary or 'Unknown'}")
+                        stats['errors'] += 1
+                        continue
 
-                        # Check if event is blacklisted
-                        if self.is_event_blacklisted(event_data.get('summary', '')):
-                            self.logger.debug(f"Skipping blacklisted event: {event_data.get('summary')}")
-                            stats['duplicates_skipped'] += 1
-                            continue
+                    # Check if event is blacklisted
+                    if is_blacklisted(summary or ''):
+                        self.logger.debug(f"Skipping blacklisted event: {summary}")
+                        stats['duplicates_skipped'] += 1
+                        continue
 
-                        # Check if event already exists in database (by 25Live reservation ID)
-                        reservation_id = event_data['metadata'].get('25live_reservation_id')
-                        event_id = event_data['metadata'].get('25live_event_id')
+                    # Check if event already exists in database (by 25Live reservation ID)
+                    metadata = event_data['metadata']
+                    reservation_id = metadata['25live_reservation_id']
+                    event_id = metadata['25live_event_id']
 
+                    # Check-and-claim is atomic across concurrently syncing calendar types
+                    with index_lock:
                         if reservation_id or event_id:
                             # Check database for existing ACTIVE event with this 25Live ID
-                            if reservation_id:
-                                existing = self.db.get_event_by_25live_id(reservation_id, self.target_calendar)
-                                if existing:
-                                    stats['duplicates_skipped'] += 1
-                                    continue
+                            if reservation_id in existing_ids:
+                                stats['duplicates_skipped'] += 1
+                                continue
 
                             # Check for DELETED events - don't recreate them!
-                            deleted_event = self.check_deleted_event(reservation_id, event_id, self.target_calendar)
-                            if deleted_event:
-                                self.logger.debug(f"Skipping previously deleted event: {event_data.get('summary')}")
+                            # Both IDs are checked: some events have an event ID
+                            # but a null reservation ID
+                            if reservation_id in deleted_ids or event_id in deleted_event_ids:
+                                self.logger.debug(f"Skipping previously deleted event: {summary}")
                                 stats['duplicates_skipped'] += 1
                                 continue
                         else:
                             # Fallback: Check by summary + start_time + calendar
-                            existing = self.db.get_event_by_time_and_summary(
-                                summary=event_data['summary'],
-                                start_time=event_data['start_time'],
-                                calendar_id=self.target_calendar
-                            )
-                            if existing:
+                            if (summary, _utc(start_time, db_zone)) in existing_keys:
                                 stats['duplicates_skipped'] += 1
-                                self.logger.debug(f"Skipping duplicate (by time/summary): {event_data['summary']}")
+                                self.logger.debug(f"Skipping duplicate (by time/summary): {summary}")
                                 continue
 
-                        # SIMPLIFIED: Create directly on Google Calendar with color
-                        event_id, ical_uid = self.create_google_calendar_event(event_data)
+                        # SIMPLIFIED: Queue for creation on Google Calendar with color
+                        if reservation_id:
+                            existing_ids.add(reservation_id)
+                        existing_keys.add((summary, _utc(start_time, db_zone)))
+                        queue_event(event_data)
 
-                        if event_id:
-                            # Record in database with Google Calendar ID
-                            event_data['event_id'] = event_id
-                            event_data['ical_uid'] = ical_uid
-                            event_data['last_action'] = 'created'
+                except Exception as e:
+                    self.logger.error(f"Error processing reservation: {e}")
+                    stats['errors'] += 1
 
-                            if self.db.record_event(event_data):
-                                stats['events_created'] += 1
-                            else:
-                                stats['errors'] += 1
-                        else:
-                            stats['errors'] += 1
+                # Send each batch as soon as it fills; later ranges keep
+                # downloading in the background meanwhile
+                if len(batch_ops) >= BATCH_SIZE:
+                    self._flush_writes(batch_ops, stats)
+                    batch_ops.clear()
 
-                    except Exception as e:
-                        self.logger.error(f"Error processing reservation: {e}")
-                        stats['errors'] += 1
+        if batch_ops:
+            self._flush_writes(batch_ops, stats)
 
         self.logger.info(f"✅ {calendar_type} sync complete:")
         self.logger.info(f"  Total reservations: {stats['total_reservations']}")
@@ -682,17 +969,36 @@ class DBAware25LiveSync:
             'stats': stats
         }
 
+    def _sync_calendar_type_in_order(self, calendar_type: str, claim_after: Optional[threading.Event],
+                                     claimed: threading.Event) -> Dict[str, Any]:
+        """Run sync_calendar_type, then let the next calendar type start claiming."""
+        try:
+            return self.sync_calendar_type(calendar_type, claim_after)
+        finally:
+            claimed.set()
+
     def run_full_sync(self) -> Dict[str, Any]:
         """Run complete synchronization of all calendar types."""
         self.logger.info("🚀 Starting database-aware 25Live synchronization...")
+        self._sync_timestamp = datetime.now().isoformat()
+        self._location_intern.clear()
         self.logger.info("📅 Date range: August 1, 2024 to 12 months forward")
 
-        # Authenticate with 25Live
-        if not self.authenticate_25live():
+        # Authenticate with 25Live while the existing-events index loads from
+        # the database (shared by both calendar types - same target calendar)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            index_load = executor.submit(self.load_existing_events)
+            authenticated = self.authenticate_25live()
+            try:
+                index_load.result()
+            except Exception as e:
+                return {'success': False, 'error': f'Failed to load existing events: {e}'}
+
+        if not authenticated:
             return {'success': False, 'error': 'Failed to authenticate with 25Live'}
 
         results = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': self._sync_timestamp,
             'success': False,
             'date_range': {
                 'start': '2024-08-01',
@@ -701,17 +1007,28 @@ class DBAware25LiveSync:
             'sync_results': {}
         }
 
-        # Sync each calendar type
-        for calendar_type in ['Classes', 'GFU Events']:
-            try:
-                result = self.sync_calendar_type(calendar_type)
-                results['sync_results'][calendar_type] = result
-            except Exception as e:
-                self.logger.error(f"Failed to sync {calendar_type}: {e}")
-                results['sync_results'][calendar_type] = {
-                    'success': False,
-                    'error': str(e)
-                }
+        # Sync calendar types concurrently - each is dominated by 25Live and
+        # Google Calendar round-trips. Claims still go in calendar_types order
+        # (Classes first), so a reservation both return keeps the same title
+        # and color from run to run.
+        with ThreadPoolExecutor(max_workers=len(self.calendar_types)) as executor:
+            futures = {}
+            claim_after = None
+            for calendar_type in self.calendar_types:
+                claimed = threading.Event()
+                futures[calendar_type] = executor.submit(
+                    self._sync_calendar_type_in_order, calendar_type, claim_after, claimed
+                )
+                claim_after = claimed
+            for calendar_type, future in futures.items():
+                try:
+                    results['sync_results'][calendar_type] = future.result()
+                except Exception as e:
+                    self.logger.error(f"Failed to sync {calendar_type}: {e}")
+                    results['sync_results'][calendar_type] = {
+                        'success': False,
+                        'error': str(e)
+                    }
 
         # Check overall success
         all_successful = all(
@@ -733,10 +1050,22 @@ class DBAware25LiveSync:
         results['total_events_created'] = total_created
         results['total_duplicates_skipped'] = total_duplicates
 
-        # Save results
+        _is_reservation_profile.cache_clear()
+
+        # Save results atomically so readers never see a half-written file
         results_file = os.path.join(PROJECT_ROOT, 'db_25live_sync_results.json')
-        with open(results_file, 'w') as f:
-            json.dump(results, f, indent=2, default=str)
+        tmp_file = results_file + '.tmp'
+        # Serialize in one go and write once; json.dump issues a write call
+        # per token
+        if orjson:
+            payload = orjson.dumps(results, option=orjson.OPT_INDENT_2, default=str)
+        else:
+            payload = json.dumps(results, indent=2, default=str).encode('utf-8')
+        with open(tmp_file, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, results_file)
 
         self.logger.info(f"🎉 Full sync complete! Created {total_created} events, skipped {total_duplicates} duplicates")
         return results
@@ -765,21 +1094,26 @@ def main():
     sync_service = DBAware25LiveSync()
     results = sync_service.run_full_sync()
 
+    # Build the summary and write it in one go
+    lines = []
     if results['success']:
-        print("✅ Synchronization completed successfully!")
+        lines.append("✅ Synchronization completed successfully!")
     else:
-        print("⚠️ Synchronization completed with some issues")
+        lines.append("⚠️ Synchronization completed with some issues")
 
-    print(f"\n📊 RESULTS:")
-    print(f"  Date range: {results['date_range']['start']} to {results['date_range']['end']}")
-    print(f"  Total events created: {results.get('total_events_created', 0)}")
-    print(f"  Total duplicates skipped: {results.get('total_duplicates_skipped', 0)}")
+    lines.append("\n📊 RESULTS:")
+    lines.append(f"  Date range: {results['date_range']['start']} to {results['date_range']['end']}")
+    lines.append(f"  Total events created: {results.get('total_events_created', 0)}")
+    lines.append(f"  Total duplicates skipped: {results.get('total_duplicates_skipped', 0)}")
 
     for calendar_type, result in results.get('sync_results', {}).items():
-        status = "✅" if result.get('success') else "❌"
-        print(f"  {status} {calendar_type}: {result.get('stats', {}).get('events_created', 0)} events")
+        status = _STATUS_ICONS[bool(result.get('success'))]
+        lines.append(f"  {status} {calendar_type}: {result.get('stats', {}).get('events_created', 0)} events")
+
+    lines.append("\n📄 Detailed results saved to: db_25live_sync_results.json")
 
-    print(f"\n📄 Detailed results saved to: db_25live_sync_results.json")
+    sys.stdout.write('\n'.join(lines) + '\n')
+    sys.stdout.flush()
 
 
 if __name__ == '__main__':
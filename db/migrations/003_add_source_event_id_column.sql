@@ -0,0 +1,13 @@
+-- Store the mirror source event ID as a column for the orphaned mirror check
+
+-- Generated from metadata, so existing writers keep setting metadata only
+ALTER TABLE calendar_events ADD COLUMN IF NOT EXISTS source_event_id TEXT
+    GENERATED ALWAYS AS (metadata->>'source_event_id') STORED;
+
+-- Add index for mirror-to-source lookups
+CREATE INDEX IF NOT EXISTS idx_source_event
+    ON calendar_events(source_event_id, source_calendar)
+    WHERE deleted_at IS NULL;
+
+-- Add comments
+COMMENT ON COLUMN calendar_events.source_event_id IS 'Event ID of the source event (if this is a mirror), generated from metadata';